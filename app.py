@@ -1,13 +1,30 @@
-<<<<<<< HEAD
 import os
-import difflib
-from flask import Flask, request, render_template, jsonify
+import json
+import random
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import Flask, request, render_template, jsonify, Response, stream_with_context, g
 from werkzeug.utils import secure_filename
-from PyPDF2 import PdfReader
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from dotenv import load_dotenv
-import requests
-import glob
+import time
+import uuid
+import cProfile
+
+from chunking import PAGE_BREAK, ChunkPacker, estimate_tokens, split_into_chunks
+from clients import ConcurrencyLimiter, ModelClient, UpstreamBusyError, WinstonClient, create_session
+from comparison import ComparisonEngine, compare_pair, get_matching_blocks
+from documents import DocumentStore
+from fakes import fake_model_factory
+from jobs import JobQueue
+from metrics import ERRORS, REQUEST_SECONDS, cache_stats_collector, registry, timed, timed_iter
+from online_plagiarism import OnlinePlagiarismChecker
+from pdf_extract import PdfExtractor
+from plagiarism_index import PlagiarismIndex
+from prompts import compile_prompts
+from response_cache import create_response_cache, make_cache_key
+from text_cache import TextCache
 
 
 load_dotenv()
@@ -16,12 +33,104 @@ app = Flask(__name__)
 app.secret_key = os.getenv('SECRET_KEY', 'fallback_secret_key')
 app.config["UPLOAD_FOLDER"] = "./uploads"
 app.config["ALLOWED_EXTENSIONS"] = {"pdf", "txt"}
+app.config["DATA_FOLDER"] = "./data"
+app.config["TEXT_CACHE_MAX_BYTES"] = int(os.getenv("TEXT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+app.config["RESPONSE_CACHE_BACKEND"] = os.getenv("RESPONSE_CACHE_BACKEND", "sqlite")
+app.config["RESPONSE_CACHE_MAX_ENTRIES"] = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+app.config["RESPONSE_CACHE_TTL"] = int(os.getenv("RESPONSE_CACHE_TTL", 24 * 60 * 60))
+app.config["CHUNK_MAX_TOKENS"] = int(os.getenv("CHUNK_MAX_TOKENS", 8000))
+app.config["PROMPT_MAX_TOKENS"] = int(os.getenv("PROMPT_MAX_TOKENS", 12000))
+app.config["MAP_WORKERS"] = int(os.getenv("MAP_WORKERS", 8))
+app.config["BATCH_CONCURRENCY"] = int(os.getenv("BATCH_CONCURRENCY", 4))
+app.config["BATCH_MAX_CONCURRENCY"] = int(os.getenv("BATCH_MAX_CONCURRENCY", 16))
+app.config["BATCH_MAX_DOCUMENTS"] = int(os.getenv("BATCH_MAX_DOCUMENTS", 200))
+app.config["BATCH_MAX_UNZIPPED_BYTES"] = int(os.getenv("BATCH_MAX_UNZIPPED_BYTES", 256 * 1024 * 1024))
+app.config["PDF_WORKERS"] = int(os.getenv("PDF_WORKERS", os.cpu_count() or 1))
+app.config["PDF_PAGES_PER_TASK"] = int(os.getenv("PDF_PAGES_PER_TASK", 16))
+app.config["PDF_PARALLEL_MIN_PAGES"] = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 64))
+app.config["PDF_MAX_CHARS"] = int(os.getenv("PDF_MAX_CHARS", 20_000_000))
+app.config["COMPARE_WORKERS"] = int(os.getenv("COMPARE_WORKERS", os.cpu_count() or 1))
+app.config["LOCAL_CHECK_TIME_BUDGET"] = float(os.getenv("LOCAL_CHECK_TIME_BUDGET", 30))
+app.config["JOB_WORKERS"] = int(os.getenv("JOB_WORKERS", 4))
+app.config["JOB_LEASE_SECONDS"] = float(os.getenv("JOB_LEASE_SECONDS", 60))
+app.config["ONLINE_CHECK_CONCURRENCY"] = int(os.getenv("ONLINE_CHECK_CONCURRENCY", 4))
+app.config["ONLINE_CHECK_MIN_CHARS"] = int(os.getenv("ONLINE_CHECK_MIN_CHARS", 300))
+app.config["ONLINE_CHECK_CACHE_TTL"] = int(os.getenv("ONLINE_CHECK_CACHE_TTL", 30 * 24 * 60 * 60))
+app.config["HTTP_POOL_SIZE"] = int(os.getenv("HTTP_POOL_SIZE", 10))
+app.config["HTTP_MAX_RETRIES"] = int(os.getenv("HTTP_MAX_RETRIES", 3))
+app.config["HTTP_CONNECT_TIMEOUT"] = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+app.config["HTTP_READ_TIMEOUT"] = float(os.getenv("HTTP_READ_TIMEOUT", 60))
+app.config["MODEL_MAX_CONCURRENCY"] = int(os.getenv("MODEL_MAX_CONCURRENCY", 8))
+app.config["MODEL_REQUESTS_PER_MINUTE"] = int(os.getenv("MODEL_REQUESTS_PER_MINUTE", 0))
+app.config["WINSTON_MAX_CONCURRENCY"] = int(os.getenv("WINSTON_MAX_CONCURRENCY", 4))
+app.config["UPSTREAM_ACQUIRE_TIMEOUT"] = float(os.getenv("UPSTREAM_ACQUIRE_TIMEOUT", 30))
+app.config["PROFILE_REQUESTS"] = os.getenv("PROFILE_REQUESTS", "").lower() in ("1", "true", "yes")
+app.config["PROFILE_SLOW_SECONDS"] = float(os.getenv("PROFILE_SLOW_SECONDS", 1.0))
+app.config["MODEL_MAX_RETRIES"] = int(os.getenv("MODEL_MAX_RETRIES", 5))
+app.config["MODEL_RETRY_BASE_DELAY"] = float(os.getenv("MODEL_RETRY_BASE_DELAY", 1.0))
 
 os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+os.makedirs(app.config["DATA_FOLDER"], exist_ok=True)
 
 genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-WINSTON_API_URL = "https://api.gowinston.ai/v2/plagiarism"
+app.config["MODEL_FACTORY"] = fake_model_factory() if os.getenv("USE_FAKE_MODEL") else genai.GenerativeModel
+WINSTON_API_URL = os.getenv("WINSTON_API_URL", "https://api.gowinston.ai/v2/plagiarism")
 WINSTON_API_KEY = os.getenv("WINSTON_API_KEY")
+GEMINI_MODEL_NAME = "gemini-1.5-flash-8b"
+
+plagiarism_index = PlagiarismIndex(os.path.join(app.config["DATA_FOLDER"], "plagiarism_index.db"))
+_plagiarism_index_synced = False
+document_store = DocumentStore(
+    app.config["UPLOAD_FOLDER"],
+    os.path.join(app.config["DATA_FOLDER"], "documents.db"),
+    signature_version=plagiarism_index.settings
+)
+text_cache = TextCache(
+    os.path.join(app.config["DATA_FOLDER"], "text_cache"),
+    max_bytes=app.config["TEXT_CACHE_MAX_BYTES"]
+)
+map_executor = ThreadPoolExecutor(max_workers=app.config["MAP_WORKERS"], thread_name_prefix="map")
+model_client = ModelClient(ConcurrencyLimiter(
+    app.config["MODEL_MAX_CONCURRENCY"],
+    requests_per_minute=app.config["MODEL_REQUESTS_PER_MINUTE"],
+    acquire_timeout=app.config["UPSTREAM_ACQUIRE_TIMEOUT"]
+))
+winston_client = WinstonClient(
+    WINSTON_API_URL,
+    WINSTON_API_KEY,
+    create_session(pool_size=app.config["HTTP_POOL_SIZE"], max_retries=app.config["HTTP_MAX_RETRIES"]),
+    ConcurrencyLimiter(app.config["WINSTON_MAX_CONCURRENCY"], acquire_timeout=app.config["UPSTREAM_ACQUIRE_TIMEOUT"]),
+    timeout=(app.config["HTTP_CONNECT_TIMEOUT"], app.config["HTTP_READ_TIMEOUT"])
+)
+pdf_extractor = PdfExtractor(
+    workers=app.config["PDF_WORKERS"],
+    pages_per_task=app.config["PDF_PAGES_PER_TASK"],
+    parallel_min_pages=app.config["PDF_PARALLEL_MIN_PAGES"],
+    max_chars=app.config["PDF_MAX_CHARS"]
+)
+comparison_engine = ComparisonEngine(workers=app.config["COMPARE_WORKERS"])
+job_queue = JobQueue(
+    os.path.join(app.config["DATA_FOLDER"], "jobs.db"),
+    workers=app.config["JOB_WORKERS"],
+    lease_seconds=app.config["JOB_LEASE_SECONDS"]
+)
+response_cache = create_response_cache(
+    app.config["RESPONSE_CACHE_BACKEND"],
+    db_path=os.path.join(app.config["DATA_FOLDER"], "response_cache.db"),
+    max_entries=app.config["RESPONSE_CACHE_MAX_ENTRIES"],
+    ttl=app.config["RESPONSE_CACHE_TTL"]
+)
+online_checker = OnlinePlagiarismChecker(
+    winston_client,
+    create_response_cache(
+        "sqlite",
+        db_path=os.path.join(app.config["DATA_FOLDER"], "plagiarism_cache.db"),
+        max_entries=100000,
+        ttl=app.config["ONLINE_CHECK_CACHE_TTL"]
+    ),
+    concurrency=app.config["ONLINE_CHECK_CONCURRENCY"],
+    min_chars=app.config["ONLINE_CHECK_MIN_CHARS"]
+)
 
 FEW_SHOT_PROMPTS = {
     "summarize": {
@@ -87,38 +196,428 @@ FEW_SHOT_PROMPTS = {
     }
 }
 
+MAP_PROMPTS = {
+    "summarize": "Summarize this section of a longer document as concise bullet points, keeping every key idea.",
+    "feedback": "Note the strengths and weaknesses of this section of a longer document in terms of structure, clarity and completeness.",
+    "extract": "Note any problem statement, objectives, methodology or conclusions that appear in this section of a longer document.",
+    "questions": "List the key concepts, claims and arguments in this section of a longer document that would make good discussion questions.",
+    "grading": "Assess this section of a longer document against the rubric criteria, noting evidence for technical accuracy, innovation, structure and clarity."
+}
+
+PROMPT_TEMPLATES, MAP_TEMPLATES = compile_prompts(FEW_SHOT_PROMPTS, MAP_PROMPTS, app.config["PROMPT_MAX_TOKENS"])
+
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config["ALLOWED_EXTENSIONS"]
 
+def iter_pdf_pages(file_path):
+    """Yield the text of each page of a PDF, from the text cache when possible."""
+    key = text_cache.key_for(file_path)
+    text = text_cache.get(key)
+    if text is not None:
+        yield from text.split(PAGE_BREAK)
+        return
+
+    # Pages go straight to the cache entry, so only the current one is held here
+    writer = None
+    try:
+        for _, page_text in timed_iter(pdf_extractor.iter_pages(file_path), "pdf_extraction"):
+            if writer is None:
+                writer = text_cache.writer(key)
+            else:
+                writer.write(PAGE_BREAK)
+            writer.write(page_text)
+            yield page_text
+    except BaseException:
+        if writer is not None:
+            writer.discard()
+        raise
+    if writer is not None:
+        writer.commit()
+
 def extract_text_from_pdf(file_path):
     try:
-        reader = PdfReader(file_path)
-        return "\n".join(page.extract_text() for page in reader.pages)
+        pages = list(iter_pdf_pages(file_path))
+        if not pages:
+            return None
+        return PAGE_BREAK.join(pages)
     except Exception as e:
         print(f"Error extracting text from PDF: {e}")
         return None
 
-def generate_response(prompt, feature):
+def iter_document_pages(file_path):
+    if file_path.lower().endswith('.pdf'):
+        yield from iter_pdf_pages(file_path)
+        return
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield f.read()
+
+def read_document_text(file_path):
+    return PAGE_BREAK.join(iter_ingest(file_path, index=False)) or None
+
+def is_temp_upload(filename):
+    return filename.startswith('temp_')
+
+def index_upload(file_path, content=None, signature=None):
     try:
-        few_shot_context = "\n\n".join([
-            f"Example Input: {ex['input']}\nExample Output: {ex['output']}"
-            for ex in FEW_SHOT_PROMPTS[feature]['examples']
-        ])
-        
-        full_prompt = (
-            f"{FEW_SHOT_PROMPTS[feature]['instruction']}\n\n"
-            f"Few-shot Examples:\n{few_shot_context}\n\n"
-            f"New Input:\n{prompt}"
+        plagiarism_index.add(
+            os.path.basename(file_path),
+            content,
+            mtime=os.path.getmtime(file_path),
+            signature=signature
         )
-
-        model = genai.GenerativeModel("gemini-1.5-flash-8b")
-        response = model.generate_content(full_prompt)
-        return response.text
+    except Exception as e:
+        print(f"Error indexing file {file_path}: {e}")
+
+def sync_plagiarism_index():
+    global _plagiarism_index_synced
+    if not _plagiarism_index_synced:
+        plagiarism_index.sync(app.config["UPLOAD_FOLDER"], read_document_text, skip=is_temp_upload)
+        _plagiarism_index_synced = True
+
+RETRYABLE_MODEL_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    UpstreamBusyError
+)
+
+def call_model(prompt, stream=False):
+    """Call the model, backing off exponentially (with jitter) on rate limits."""
+    delay = app.config["MODEL_RETRY_BASE_DELAY"]
+    for attempt in range(app.config["MODEL_MAX_RETRIES"] + 1):
+        try:
+            with timed("llm_call"):
+                return model_client.generate(app.config["MODEL_FACTORY"], GEMINI_MODEL_NAME, prompt, stream=stream)
+        except RETRYABLE_MODEL_ERRORS as e:
+            if attempt == app.config["MODEL_MAX_RETRIES"]:
+                raise
+            wait = delay + random.uniform(0, delay)
+            print(f"Model API busy ({e}), retrying in {wait:.1f}s")
+            time.sleep(wait)
+            delay *= 2
+
+def response_cache_key(prompt, feature):
+    return make_cache_key(
+        feature,
+        PROMPT_TEMPLATES[feature].prefix,
+        [],
+        GEMINI_MODEL_NAME,
+        prompt,
+        settings={
+            "prompt_max_tokens": app.config["PROMPT_MAX_TOKENS"],
+            "chunk_max_tokens": app.config["CHUNK_MAX_TOKENS"]
+        }
+    )
+
+def build_reduce_input(notes):
+    combined = "\n\n".join(
+        f"Section {i} of {len(notes)}:\n{note}" for i, note in enumerate(notes, 1)
+    )
+    return (
+        "The document was too long to process at once. These are notes taken from each "
+        f"of its sections, in order:\n\n{combined}"
+    )
+
+def call_template(template, text, stream=False):
+    """Call the model with a compiled prompt template and its input."""
+    with timed("prompt_build"):
+        prompt = template.render(text)
+    return call_model(prompt, stream=stream)
+
+def map_chunk(chunk, feature):
+    cache_key = make_cache_key(f"{feature}:map", MAP_PROMPTS[feature], [], GEMINI_MODEL_NAME, chunk)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    response = call_template(MAP_TEMPLATES[feature], chunk)
+    response_cache.set(cache_key, response.text)
+    return response.text
+
+def iter_completed(futures):
+    """Yield (index, notes) for map futures as each finishes, cancelling the rest if stopped early."""
+    try:
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+def iter_map_chunks(chunks, feature):
+    """Run the map step over all chunks, yielding (index, notes) as each finishes."""
+    return iter_completed({map_executor.submit(map_chunk, chunk, feature): i for i, chunk in enumerate(chunks)})
+
+def chunk_budget(feature):
+    return min(
+        app.config["CHUNK_MAX_TOKENS"],
+        PROMPT_TEMPLATES[feature].input_tokens,
+        MAP_TEMPLATES[feature].input_tokens
+    )
+
+def split_prompt(prompt, feature):
+    """Split input that does not fit in a single prompt for the map-reduce path."""
+    max_tokens = chunk_budget(feature)
+    if estimate_tokens(prompt) <= max_tokens:
+        return [prompt]
+    return split_into_chunks(prompt, max_tokens)
+
+def group_notes(notes, max_tokens):
+    """Pack consecutive notes into groups whose combined reduce input fits ``max_tokens``."""
+    groups = []
+    current = []
+    for note in notes:
+        if current and estimate_tokens(build_reduce_input(current + [note])) > max_tokens:
+            groups.append(current)
+            current = []
+        current.append(note)
+    if current:
+        groups.append(current)
+    if len(groups) == len(notes):
+        # Every note fills a group on its own; merge pairs so each level still shrinks
+        groups = [notes[i:i + 2] for i in range(0, len(notes), 2)]
+    return groups
+
+def iter_map_reduce(chunks, feature):
+    """Run the map step, then merge the notes in groups until they fit the final prompt.
+
+    Yields ("progress", {...}) as map and merge calls finish, then
+    ("input", text) with the input for the final reduce call.
+    """
+    yield from iter_reduce(iter_map_chunks(chunks, feature), len(chunks), feature)
+
+def iter_reduce(mapped, total, feature):
+    """Collect (index, notes) pairs from the map step and merge them as iter_map_reduce does."""
+    notes = [None] * total
+    for done, (index, note) in enumerate(mapped, 1):
+        notes[index] = note
+        yield "progress", {"chunk": index, "done": done, "total": total}
+
+    level = 1
+    while len(notes) > 1 and estimate_tokens(build_reduce_input(notes)) > PROMPT_TEMPLATES[feature].input_tokens:
+        groups = [build_reduce_input(group) for group in group_notes(notes, chunk_budget(feature))]
+        notes = [None] * len(groups)
+        for done, (index, note) in enumerate(iter_map_chunks(groups, feature), 1):
+            notes[index] = note
+            yield "progress", {"level": level, "chunk": index, "done": done, "total": len(groups)}
+        level += 1
+    yield "input", build_reduce_input(notes)
+
+def generate_output(prompt, feature, progress=None):
+    """Generate a feature's output for the prompt, raising if the model call fails."""
+    cache_key = response_cache_key(prompt, feature)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    chunks = split_prompt(prompt, feature)
+    text = prompt
+    if len(chunks) > 1:
+        for event, data in iter_map_reduce(chunks, feature):
+            if event == "input":
+                text = data
+            elif progress:
+                progress(data["done"], data["total"])
+
+    response = call_template(PROMPT_TEMPLATES[feature], text)
+    response_cache.set(cache_key, response.text)
+    return response.text
+
+def generate_response(prompt, feature, progress=None):
+    try:
+        return generate_output(prompt, feature, progress)
     except Exception as e:
         print(f"Error generating response: {e}")
         return f"An error occurred: {str(e)}"
 
+def generate_response_stream(prompt, feature):
+    """Yield ("progress", {...}) events for the map and merge steps, then ("token", text) events."""
+    cache_key = response_cache_key(prompt, feature)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        yield "token", cached
+        return
+
+    chunks = split_prompt(prompt, feature)
+    events = iter_map_reduce(chunks, feature) if len(chunks) > 1 else iter([("input", prompt)])
+    yield from iter_final_tokens(events, feature, cache_key)
+
+def iter_final_tokens(events, feature, cache_key):
+    """Pass map-reduce progress events through, then stream the final call and cache its output."""
+    text = None
+    for event, data in events:
+        if event == "input":
+            text = data
+        else:
+            yield event, data
+
+    response = call_template(PROMPT_TEMPLATES[feature], text, stream=True)
+    parts = []
+    for chunk in response:
+        text = chunk.text
+        if text:
+            parts.append(text)
+            yield "token", text
+    response_cache.set(cache_key, "".join(parts))
+
+def iter_page_stream(pages, feature, overlap=False):
+    """Yield ("page", text) as each page is read, then the generate_response_stream events.
+
+    With ``overlap`` set, pages are packed into the same chunks split_prompt
+    would make while they are read and each full chunk's map call starts at
+    once, so a long PDF is summarised while its later pages are still being
+    extracted. The whole-document response cache can then only be checked
+    once the text is complete; map calls not yet started are cancelled on a
+    hit.
+    """
+    packer = ChunkPacker(chunk_budget(feature))
+    futures = {}
+    parts = []
+    try:
+        for page in pages:
+            parts.append(page)
+            yield "page", page
+            if overlap:
+                for chunk in packer.feed(page):
+                    futures[map_executor.submit(map_chunk, chunk, feature)] = len(futures)
+        content = PAGE_BREAK.join(parts)
+        if not content:
+            yield "error", {"error": "Could not extract text from document"}
+            return
+        if not futures:
+            yield from generate_response_stream(content, feature)
+            return
+
+        cache_key = response_cache_key(content, feature)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            yield "token", cached
+            return
+        for chunk in packer.close():
+            futures[map_executor.submit(map_chunk, chunk, feature)] = len(futures)
+        mapped = iter_completed(futures)
+        yield from iter_final_tokens(iter_reduce(mapped, len(futures), feature), feature, cache_key)
+    finally:
+        for future in futures:
+            future.cancel()
+
+def needs_extraction(file_path):
+    """Return True if reading an upload means extracting a PDF that is not in the text cache."""
+    return file_path.lower().endswith('.pdf') and not text_cache.contains(text_cache.key_for(file_path))
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def iter_ingest(file_path, index=True):
+    """Yield the pages of a saved upload, fingerprinting it the first time it is seen.
+
+    A file without a document record has its MinHash signature computed
+    while it is read, recorded and, if ``index`` is set, added to the
+    plagiarism index. Later reads only fetch the text, which for PDFs comes
+    from the text cache. Temporary uploads are read without a record.
+    """
+    name = os.path.basename(file_path)
+    stat = os.stat(file_path)
+    if is_temp_upload(name) or document_store.get(name, stat.st_mtime, stat.st_size) is not None:
+        yield from iter_document_pages(file_path)
+        return
+
+    hasher = plagiarism_index.minhasher()
+    pages = characters = 0
+    has_text = False
+    for page in iter_document_pages(file_path):
+        hasher.update(page)
+        characters += len(page) + (len(PAGE_BREAK) if pages else 0)
+        pages += 1
+        has_text = has_text or bool(page)
+        yield page
+    signature = hasher.digest() if has_text else None
+    document_store.put(name, characters, pages, signature, stat.st_mtime, stat.st_size)
+    if index and signature:
+        index_upload(file_path, signature=signature)
+
+def document_signature(file_path):
+    """Return the recorded MinHash signature of a saved upload, or None."""
+    stat = os.stat(file_path)
+    record = document_store.get(os.path.basename(file_path), stat.st_mtime, stat.st_size)
+    return record["signature"] if record else None
+
+def ingest_file(file_path):
+    try:
+        return PAGE_BREAK.join(iter_ingest(file_path)) or None
+    except Exception as e:
+        print(f"Error reading file {file_path}: {e}")
+        return None
+
+def save_upload(file):
+    with timed("upload_save"):
+        return document_store.save(file.stream, secure_filename(file.filename))
+
+def display_name(file_path):
+    names = document_store.filenames(os.path.basename(file_path))
+    return names[0] if names else os.path.basename(file_path)
+
+def get_request_content():
+    pasted_text = request.form.get("pasted_text")
+    file = request.files.get("file")
+
+    if pasted_text:
+        return pasted_text
+    if file and allowed_file(file.filename):
+        return ingest_file(save_upload(file))
+    return None
+
+def list_zip_members(archive):
+    """Return (name, member) pairs for the PDF and text members of a zip, without extracting them."""
+    members = []
+    for member in archive.infolist():
+        name = secure_filename(os.path.basename(member.filename))
+        if member.is_dir() or not name or not allowed_file(name):
+            continue
+        members.append((name, member))
+    return members
+
+def get_batch_documents():
+    """Collect (name, content) pairs from pasted text, uploaded files and zips.
+
+    The document count and the unzipped size are checked against the batch
+    limits before anything is stored; a batch over either limit raises
+    ValueError.
+    """
+    pasted_text = request.form.get("pasted_text")
+    uploads = []
+    archives = []
+    for file in request.files.getlist("file") + request.files.getlist("files"):
+        if not file or not file.filename:
+            continue
+        if file.filename.lower().endswith('.zip'):
+            archive = zipfile.ZipFile(file.stream)
+            archives.append((archive, list_zip_members(archive)))
+        elif allowed_file(file.filename):
+            uploads.append(file)
+
+    count = bool(pasted_text) + len(uploads) + sum(len(members) for _, members in archives)
+    if count > app.config["BATCH_MAX_DOCUMENTS"]:
+        raise ValueError(f"At most {app.config['BATCH_MAX_DOCUMENTS']} documents per batch")
+    unzipped = sum(member.file_size for _, members in archives for _, member in members)
+    if unzipped > app.config["BATCH_MAX_UNZIPPED_BYTES"]:
+        raise ValueError(f"Zip contents exceed {app.config['BATCH_MAX_UNZIPPED_BYTES']} bytes")
+
+    # Reads from a zip member stop at its declared size, so the check above bounds what is written
+    paths = [(secure_filename(file.filename), save_upload(file)) for file in uploads]
+    for archive, members in archives:
+        with archive:
+            for name, member in members:
+                with archive.open(member) as src:
+                    paths.append((name, document_store.save(src, name)))
+
+    documents = []
+    if pasted_text:
+        documents.append(("pasted_text", pasted_text))
+    for name, file_path in paths:
+        documents.append((name, ingest_file(file_path)))
+    return documents
+
 @app.route("/", methods=["GET", "POST"])
 def home():
     content = None
@@ -126,20 +625,7 @@ def home():
     feature = request.form.get("feature")
 
     if request.method == "POST":
-        pasted_text = request.form.get("pasted_text")
-        file = request.files.get("file")
-
-        if pasted_text:
-            content = pasted_text
-        elif file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            file_path = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-            file.save(file_path)
-            
-            if file.filename.lower().endswith('.pdf'):
-                content = extract_text_from_pdf(file_path)
-            else:
-                content = file.read().decode('utf-8')
+        content = get_request_content()
 
         if content and feature in FEW_SHOT_PROMPTS:
             prompt = f"{content}"
@@ -147,278 +633,357 @@ def home():
 
     return render_template("index.html", content=content, output=output)
 
-def check_local_plagiarism(file_path):
+@app.route("/stream", methods=["POST"])
+def stream():
+    feature = request.form.get("feature")
+    if feature not in FEW_SHOT_PROMPTS:
+        return jsonify({"error": "Invalid feature"}), 400
+
+    pasted_text = request.form.get("pasted_text")
+    file = request.files.get("file")
+    extracting = False
+    if pasted_text:
+        pages = [pasted_text]
+    elif file and allowed_file(file.filename):
+        file_path = save_upload(file)
+        extracting = needs_extraction(file_path)
+        pages = iter_ingest(file_path)
+    else:
+        return jsonify({"error": "No content provided"}), 400
+
+    def events():
+        try:
+            # Only extraction is slow enough to overlap with map calls; text already at hand
+            # goes through generate_response_stream, which checks the response cache first
+            for event, data in iter_page_stream(pages, feature, overlap=extracting):
+                yield sse_event(event, {"text": data} if event in ("page", "token") else data)
+        except Exception as e:
+            print(f"Error streaming response: {e}")
+            yield sse_event("error", {"error": str(e)})
+        yield sse_event("done", {})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.route("/api/batch", methods=["POST"])
+def batch():
+    features = request.form.getlist("features") or request.form.getlist("feature")
+    features = [f.strip() for value in features for f in value.split(",") if f.strip()]
+    if not features:
+        features = list(FEW_SHOT_PROMPTS)
+    unknown = [f for f in features if f not in FEW_SHOT_PROMPTS]
+    if unknown:
+        return jsonify({"error": f"Unknown features: {', '.join(unknown)}"}), 400
+
     try:
-        current_content = ""
-        if file_path.lower().endswith('.pdf'):
-            current_content = extract_text_from_pdf(file_path)
-        else:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                current_content = f.read()
+        concurrency = int(request.form.get("concurrency", app.config["BATCH_CONCURRENCY"]))
+    except ValueError:
+        return jsonify({"error": "concurrency must be an integer"}), 400
+    concurrency = max(1, min(concurrency, app.config["BATCH_MAX_CONCURRENCY"]))
 
-        if not current_content:
-            return []
+    try:
+        documents = get_batch_documents()
+    except zipfile.BadZipFile as e:
+        return jsonify({"error": f"Invalid zip file: {e}"}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not documents:
+        return jsonify({"error": "No documents provided"}), 400
+
+    results = [{"document": name, "outputs": {}} for name, _ in documents]
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch") as executor:
+        futures = {}
+        for i, (name, content) in enumerate(documents):
+            if not content:
+                results[i]["error"] = "Could not extract text from document"
+                continue
+            for feature in features:
+                futures[executor.submit(generate_output, content, feature)] = (i, feature)
+        for future in as_completed(futures):
+            i, feature = futures[future]
+            try:
+                results[i]["outputs"][feature] = future.result()
+            except Exception as e:
+                print(f"Error generating {feature} for {results[i]['document']}: {e}")
+                results[i].setdefault("errors", {})[feature] = str(e)
+
+    return jsonify({"features": features, "results": results})
+
+def local_plagiarism_report(file_path):
+    try:
+        current_content = read_document_text(file_path)
 
-        results = []
-        all_files = glob.glob(os.path.join(app.config["UPLOAD_FOLDER"], "*"))
-        
-        for other_file in all_files:
-            if other_file != file_path and not os.path.basename(other_file).startswith('temp_'): 
+        if not current_content:
+            return {"results": [], "partial": False}
+
+        with timed("local_candidates"):
+            sync_plagiarism_index()
+            candidates = plagiarism_index.query(
+                current_content,
+                exclude=os.path.basename(file_path),
+                signature=document_signature(file_path)
+            )
+
+        with timed("local_compare"):
+            # Identical content uploaded under other names shares this file
+            duplicates = []
+            for name in document_store.filenames(os.path.basename(file_path))[:-1]:
+                duplicate = compare_pair(current_content, name, current_content)
+                if duplicate:
+                    duplicates.append(duplicate)
+
+            documents = []
+            for name in candidates:
+                other_file = os.path.join(app.config["UPLOAD_FOLDER"], name)
+                if is_temp_upload(name) or not os.path.isfile(other_file):
+                    continue
                 try:
-                    other_content = ""
-                    if other_file.lower().endswith('.pdf'):
-                        other_content = extract_text_from_pdf(other_file)
-                    else:
-                        with open(other_file, 'r', encoding='utf-8') as f:
-                            other_content = f.read()
-                    
-                    if other_content: 
-                        similarity = difflib.SequenceMatcher(None, current_content, other_content).ratio()
-                        
-                        if similarity > 0.1: 
-                            matched_blocks = get_matching_blocks(current_content, other_content)
-                            if matched_blocks: 
-                                results.append({
-                                    'file': os.path.basename(other_file),
-                                    'similarity': round(similarity * 100, 2),
-                                    'matched_content': matched_blocks
-                                })
+                    other_content = read_document_text(other_file)
+                    if other_content:
+                        documents.append((display_name(other_file), other_content))
                 except Exception as e:
+                    ERRORS.inc(stage="local_compare")
                     print(f"Error processing file {other_file}: {e}")
                     continue
 
-        return results
+            results, complete = comparison_engine.compare(
+                current_content,
+                documents,
+                time_budget=app.config["LOCAL_CHECK_TIME_BUDGET"]
+            )
+        if not complete:
+            print(f"Local plagiarism check for {file_path} ran out of time, returning partial results")
+        return {"results": duplicates + results, "partial": not complete}
 
     except Exception as e:
         print(f"Error in check_local_plagiarism: {e}")
-        return []
+        return {"results": [], "partial": False}
 
-def check_online_plagiarism(text):
+def check_local_plagiarism(file_path):
+    return local_plagiarism_report(file_path)["results"]
 
+def online_plagiarism_report(text):
     try:
-        headers = {
-            "Authorization": "riMUHI2kElitOU5DHPW0yxBIznkVQfd9oPMq3IFR9a3bcc8b",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "text": text,
-            "language": "en",
-            "country": "us"
-        }
-        
-        response = requests.post(WINSTON_API_URL, json=payload, headers=headers)
-        response_data = response.json()
-        
-        score = response_data.get("result", {}).get("score", None)
-        
-        if score is not None:
-            print(f"Plagiarism Score: {score}%")
-            return score
-        else:
-            print("Unable to retrieve score from the API response.")
-            return None
+        with timed("online_check"):
+            report = online_checker.check(text)
+        if report.get("failed") or "error" in report:
+            ERRORS.inc(report.get("failed") or 1, stage="online_check")
+        if "score" in report:
+            print(f"Plagiarism Score: {report['score']}% "
+                  f"({report['checked']} passages checked, {report['cached']} cached)")
+        return report
     except Exception as e:
         print(f"Error in check_online_plagiarism: {e}")
         return {"error": str(e)}
 
+def check_online_plagiarism(text):
+    report = online_plagiarism_report(text)
+    if "score" in report:
+        return report["score"]
+    if "passages" in report:
+        print("Unable to retrieve score from the API response.")
+        return None
+    return report
 
-def get_matching_blocks(text1, text2, context_length=50):
 
-    matcher = difflib.SequenceMatcher(None, text1, text2)
-    matches = []
-    
-    for block in matcher.get_matching_blocks():
-        if block.size > 20: 
-            start = max(0, block.a - context_length)
-            end = min(len(text1), block.a + block.size + context_length)
-            matches.append(text1[start:end])
-    
-    return matches[:3] 
+@app.route("/cache/stats")
+def cache_stats():
+    return jsonify({
+        "responses": response_cache.stats(),
+        "documents": document_store.stats(),
+        "online_plagiarism": online_checker.cache.stats()
+    })
 
-@app.route("/check_plagiarism", methods=["POST"])
-def check_plagiarism():
-    try:
-        check_type = request.form.get("check_type")
-        content = None
-        file_path = None
-        
-        if 'file' in request.files:
-            file = request.files['file']
-            if file and (allowed_file(file.filename) or file.filename == 'pasted_text.txt'):
-                filename = secure_filename(file.filename)
-                file_path = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-                file.save(file_path)
-                
-                if file.filename.lower().endswith('.pdf'):
-                    content = extract_text_from_pdf(file_path)
-                else:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-        else:
-            content = request.form.get("content")
-            if content and check_type == "local":
-
-                temp_filename = f"temp_{int(time.time())}.txt"
-                file_path = os.path.join(app.config["UPLOAD_FOLDER"], temp_filename)
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-        
-        if check_type == "local" and file_path:
-            results = check_local_plagiarism(file_path)
-            if file_path.startswith(os.path.join(app.config["UPLOAD_FOLDER"], "temp_")):
-                try:
-                    os.remove(file_path)
-                except Exception as e:
-                    print(f"Error removing temporary file: {e}")
-            return jsonify({"results": results})
-        
-        if check_type == "online" and content:
-            results = check_online_plagiarism(content)
-            return jsonify(results)
-        
-        return jsonify({"error": "Invalid request"})
-    
-    except Exception as e:
-        print(f"Error in check_plagiarism: {e}") 
-        return jsonify({"error": str(e)})
-    
-if __name__ == "__main__":
-=======
-import os
-from flask import Flask, request, render_template
-from werkzeug.utils import secure_filename
-from PyPDF2 import PdfReader
-import google.generativeai as genai
-from dotenv import load_dotenv
+def prepare_plagiarism_check():
+    """Save the submitted document and return (check_type, file_path, content)."""
+    check_type = request.form.get("check_type")
+    content = None
+    file_path = None
 
-# Load environment variables
-load_dotenv()
+    if 'file' in request.files:
+        file = request.files['file']
+        if file and file.filename == 'pasted_text.txt':
+            # Pasted drafts are checked but never stored, recorded or indexed
+            file_path = os.path.join(app.config["UPLOAD_FOLDER"], f"temp_{uuid.uuid4().hex}.txt")
+            file.save(file_path)
+        elif file and allowed_file(file.filename):
+            file_path = save_upload(file)
+    else:
+        content = request.form.get("content")
+        if content and check_type == "local":
 
-app = Flask(__name__)
-app.secret_key = os.getenv('SECRET_KEY', 'fallback_secret_key')
-app.config["UPLOAD_FOLDER"] = "./uploads"
-app.config["ALLOWED_EXTENSIONS"] = {"pdf", "txt"}
+            temp_filename = f"temp_{uuid.uuid4().hex}.txt"
+            file_path = os.path.join(app.config["UPLOAD_FOLDER"], temp_filename)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(content)
 
-# Create uploads directory if it doesn't exist
-os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+    return check_type, file_path, content
 
-# Configure Gemini API
-genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-WINSTON_API_URL = "https://api.gowinston.ai/v2/plagiarism"
-WINSTON_API_KEY = os.getenv("WINSTON_API_KEY")
+def run_plagiarism_check(check_type, file_path, content):
+    try:
+        if file_path and content is None:
+            content = ingest_file(file_path)
 
+        if check_type == "local" and file_path:
+            return local_plagiarism_report(file_path)
 
-# Few-shot prompt templates
-FEW_SHOT_PROMPTS = {
-    "summarize": {
-        "examples": [
-            {
-                "input": "Machine learning is a method of data analysis that automates analytical model building. It is a branch of artificial intelligence based on the idea that systems can learn from data, identify patterns and make decisions with minimal human intervention.",
-                "output": "Key Points:\n• Machine learning is a data analysis method within artificial intelligence\n• Focuses on systems learning and identifying patterns automatically\n• Minimizes the need for human intervention in analytical processes"
-            },
-            {
-                "input": "Climate change is a long-term shift in global or regional climate patterns. It involves changes in temperature, precipitation, and extreme weather events, primarily driven by human activities like greenhouse gas emissions.",
-                "output": "Key Points:\n• Climate change represents significant long-term shifts in global weather patterns\n• Involves changes in temperature, precipitation, and extreme weather\n• Primarily attributed to human-induced greenhouse gas emissions"
-            }
-        ],
-        "instruction": "Provide a concise summary with clear, bullet-pointed key points."
-    },
-    "feedback": {
-        "examples": [
-            {
-                "input": "The research paper discusses the impact of social media on mental health among teenagers. It explores various psychological effects and suggests potential mitigation strategies.",
-                "output": "Feedback:\n• Structure: Clear progression from problem identification to potential solutions\n• Clarity: Technical terms are well-explained, making the content accessible\n• Completeness: Covers multiple dimensions of the social media-mental health relationship"
-            }
-        ],
-        "instruction": "Provide constructive feedback focusing on structure, clarity, and completeness in a concise, professional manner."
-    },
-    "extract": {
-        "examples": [
-            {
-                "input": "A comprehensive study on renewable energy implementation in urban environments. The research examines solar and wind energy potential in metropolitan areas, analyzing infrastructure challenges and economic feasibility. Key objectives include identifying sustainable energy solutions and reducing carbon emissions.",
-                "output": "Key Sections:\n• Problem Statement: Urban energy sustainability and carbon emission reduction\n• Objectives: Identify renewable energy potential in metropolitan settings\n• Methodology: Analyzing solar and wind energy infrastructure and economic viability\n• Conclusions: Potential for implementable sustainable urban energy solutions"
-            }
-        ],
-        "instruction": "Extract key sections with clear, concise descriptions."
-    },
-    "questions": {
-        "examples": [
-            {
-                "input": "Artificial Intelligence represents a transformative technology that combines machine learning, neural networks, and advanced algorithms to create systems capable of performing complex cognitive tasks.",
-                "output": "Viva/Presentation Questions:\n1. How do neural networks differ from traditional computing approaches?\n2. What are the ethical considerations in AI development?\n3. Explain the role of machine learning in AI system evolution\n4. Discuss potential limitations of current AI technologies"
-            }
-        ],
-        "instruction": "Generate thought-provoking, academically relevant questions."
-    }
-}
+        if check_type == "online" and content:
+            return online_plagiarism_report(content)
 
-def allowed_file(filename):
-    """Check if the file has an allowed extension."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config["ALLOWED_EXTENSIONS"]
+        return {"error": "Invalid request"}
+    finally:
+        if file_path and is_temp_upload(os.path.basename(file_path)):
+            try:
+                os.remove(file_path)
+            except Exception as e:
+                print(f"Error removing temporary file: {e}")
 
-def extract_text_from_pdf(file_path):
-    """Extract text from a PDF file."""
+@app.route("/check_plagiarism", methods=["POST"])
+def check_plagiarism():
     try:
-        reader = PdfReader(file_path)
-        return "\n".join(page.extract_text() for page in reader.pages)
+        return jsonify(run_plagiarism_check(*prepare_plagiarism_check()))
+    
     except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
-        return None
-
-def generate_response(prompt, feature):
-    """Generate a response using Gemini API with few-shot prompting."""
-    try:
-        #few-shot prompt
-        few_shot_context = "\n\n".join([
-            f"Example Input: {ex['input']}\nExample Output: {ex['output']}"
-            for ex in FEW_SHOT_PROMPTS[feature]['examples']
-        ])
-        
-        full_prompt = (
-            f"{FEW_SHOT_PROMPTS[feature]['instruction']}\n\n"
-            f"Few-shot Examples:\n{few_shot_context}\n\n"
-            f"New Input:\n{prompt}"
-        )
+        print(f"Error in check_plagiarism: {e}") 
+        return jsonify({"error": str(e)})
 
-        model = genai.GenerativeModel("gemini-1.5-flash-8b")
-        response = model.generate_content(full_prompt)
-        return response.text
-    except Exception as e:
-        print(f"Error generating response: {e}")
-        return f"An error occurred: {str(e)}"
+def run_plagiarism_job(params, progress):
+    return run_plagiarism_check(params["check_type"], params["file_path"], params["content"])
+
+def run_generate_job(params, progress):
+    content = params["content"]
+    if content is None:
+        content = ingest_file(params["file_path"])
+    if not content:
+        raise ValueError("Could not extract text from document")
+    output = generate_output(
+        content,
+        params["feature"],
+        progress=lambda done, total: progress(done=done, total=total)
+    )
+    return {"output": output}
+
+job_queue.register("plagiarism", run_plagiarism_job)
+job_queue.register("generate", run_generate_job)
+# Pool workers started from a forkserver re-import this module as __mp_main__ when it is
+# run as a script; only the serving process may take over jobs
+if __name__ != "__mp_main__":
+    job_queue.resume()
+
+registry.register_collector(cache_stats_collector({
+    "responses": response_cache,
+    "online_plagiarism": online_checker.cache,
+    "pdf_text": text_cache,
+    "documents": document_store
+}))
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.profiler = None
+    if app.config["PROFILE_REQUESTS"]:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            g.profiler = profiler
+        except ValueError:
+            # Another request on a different thread is already being profiled
+            pass
+
+@app.after_request
+def record_request_time(response):
+    # A streamed body is generated after this hook returns, so finish once it is closed
+    started = g.get("request_started", time.perf_counter())
+    profiler = g.get("profiler")
+    endpoint = request.endpoint or "unknown"
+    method = request.method
+    path = request.path
+
+    def finish():
+        elapsed = time.perf_counter() - started
+        REQUEST_SECONDS.observe(elapsed, endpoint=endpoint, method=method)
+        if profiler is not None:
+            profiler.disable()
+            if elapsed >= app.config["PROFILE_SLOW_SECONDS"]:
+                profile_folder = os.path.join(app.config["DATA_FOLDER"], "profiles")
+                os.makedirs(profile_folder, exist_ok=True)
+                profile_path = os.path.join(
+                    profile_folder,
+                    f"{time.strftime('%Y%m%d-%H%M%S')}_{endpoint}_{uuid.uuid4().hex[:8]}.prof"
+                )
+                profiler.dump_stats(profile_path)
+                print(f"Slow request {method} {path} took {elapsed:.2f}s, profile saved to {profile_path}")
+
+    response.call_on_close(finish)
+    return response
+
+@app.route("/metrics")
+def metrics():
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+def job_status(job):
+    return {
+        "id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"]
+    }
 
-@app.route("/", methods=["GET", "POST"])
-def home():
-    """Main route to handle file/text processing and AI features."""
-    content = None
-    output = None
+@app.route("/jobs/plagiarism", methods=["POST"])
+def submit_plagiarism_job():
+    check_type, file_path, content = prepare_plagiarism_check()
+    if check_type not in ("local", "online") or not (file_path or content):
+        return jsonify({"error": "Invalid request"}), 400
+    job_id = job_queue.submit("plagiarism", {
+        "check_type": check_type,
+        "file_path": file_path,
+        "content": content
+    })
+    return jsonify({"job_id": job_id, "status_url": f"/jobs/{job_id}"}), 202
+
+@app.route("/jobs/generate", methods=["POST"])
+def submit_generate_job():
     feature = request.form.get("feature")
-
-    if request.method == "POST":
-        pasted_text = request.form.get("pasted_text")
-        file = request.files.get("file")
-
-        # Determine content source
-        if pasted_text:
-            content = pasted_text
-        elif file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            file_path = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-            file.save(file_path)
-            
-            if file.filename.lower().endswith('.pdf'):
-                content = extract_text_from_pdf(file_path)
-            else:
-                content = file.read().decode('utf-8')
-
-        # Process content based on selected feature
-        if content and feature in FEW_SHOT_PROMPTS:
-            prompt = f"{content}"
-            output = generate_response(prompt, feature)
-
-    return render_template("index.html", content=content, output=output)
-
+    if feature not in FEW_SHOT_PROMPTS:
+        return jsonify({"error": "Invalid feature"}), 400
+
+    pasted_text = request.form.get("pasted_text")
+    file = request.files.get("file")
+    params = {"feature": feature, "content": None, "file_path": None}
+    if pasted_text:
+        params["content"] = pasted_text
+    elif file and allowed_file(file.filename):
+        params["file_path"] = save_upload(file)
+    else:
+        return jsonify({"error": "No content provided"}), 400
+
+    job_id = job_queue.submit("generate", params)
+    return jsonify({"job_id": job_id, "status_url": f"/jobs/{job_id}"}), 202
+
+@app.route("/jobs/<job_id>")
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job_status(job))
+
+@app.route("/jobs/<job_id>/result")
+def get_job_result(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if job["status"] == "failed":
+        return jsonify({"status": job["status"], "error": job["error"]}), 500
+    if job["status"] != "succeeded":
+        return jsonify(job_status(job)), 202
+    return jsonify({"status": job["status"], "result": job["result"]})
+    
 if __name__ == "__main__":
->>>>>>> cba552061b9e858a30f9929f82b0a2dd3ab1649c
     app.run(debug=True)
\ No newline at end of file
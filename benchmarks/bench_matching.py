@@ -0,0 +1,113 @@
+"""Compare the winnowing matcher against the previous difflib implementation.
+
+Usage: python benchmarks/bench_matching.py [--sizes 1000,5000,20000,50000] [--repeat 3]
+
+For each document size (in characters) a pair of synthetic documents is
+generated that shares a fixed fraction of its text, and both engines score
+the pair. The difflib path can be skipped above a size with --difflib-max,
+since it grows quadratically.
+"""
+import argparse
+import difflib
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matching import match_documents  # noqa: E402
+
+VOCABULARY = [
+    "analysis", "data", "model", "system", "learning", "energy", "climate", "policy",
+    "network", "results", "method", "study", "urban", "design", "process", "impact",
+    "research", "theory", "values", "growth", "market", "signal", "student", "report",
+    "the", "of", "and", "to", "in", "is", "for", "with", "on", "as", "by", "that",
+]
+
+
+def difflib_match(text1, text2, context_length=50):
+    similarity = difflib.SequenceMatcher(None, text1, text2).ratio()
+    matcher = difflib.SequenceMatcher(None, text1, text2)
+    matches = []
+    for block in matcher.get_matching_blocks():
+        if block.size > 20:
+            start = max(0, block.a - context_length)
+            end = min(len(text1), block.a + block.size + context_length)
+            matches.append(text1[start:end])
+    return similarity, matches[:3]
+
+
+def random_text(rng, chars):
+    words = []
+    length = 0
+    while length < chars:
+        word = rng.choice(VOCABULARY)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:chars]
+
+
+def make_pair(rng, chars, overlap=0.3):
+    """Build two documents where ``overlap`` of the second is copied from the first."""
+    original = random_text(rng, chars)
+    copied = int(chars * overlap)
+    start = rng.randint(0, chars - copied)
+    other = random_text(rng, chars - copied)
+    split = rng.randint(0, len(other))
+    return original, other[:split] + " " + original[start:start + copied] + " " + other[split:]
+
+
+def timed(fn, *args, repeat=1):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,5000,20000,50000,100000")
+    parser.add_argument("--overlap", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--difflib-max", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = []
+    for size in (int(value) for value in args.sizes.split(",")):
+        text1, text2 = make_pair(rng, size, args.overlap)
+        row = {"chars": size}
+        seconds, (similarity, snippets) = timed(match_documents, text1, text2, repeat=args.repeat)
+        row.update(winnowing_seconds=seconds, winnowing_similarity=round(similarity, 4),
+                   winnowing_snippets=len(snippets))
+        if size <= args.difflib_max:
+            seconds, (similarity, snippets) = timed(difflib_match, text1, text2, repeat=args.repeat)
+            row.update(difflib_seconds=seconds, difflib_similarity=round(similarity, 4),
+                       difflib_snippets=len(snippets))
+        rows.append(row)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'chars':>8} {'winnowing s':>12} {'difflib s':>10} {'speedup':>8} {'win sim':>8} {'dl sim':>8}")
+    for row in rows:
+        difflib_seconds = row.get("difflib_seconds")
+        speedup = f"{difflib_seconds / row['winnowing_seconds']:.1f}x" if difflib_seconds else "-"
+        print(
+            f"{row['chars']:>8} {row['winnowing_seconds']:>12.4f} "
+            f"{difflib_seconds if difflib_seconds is not None else float('nan'):>10.4f} {speedup:>8} "
+            f"{row['winnowing_similarity']:>8.3f} {row.get('difflib_similarity', float('nan')):>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
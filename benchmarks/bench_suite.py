@@ -0,0 +1,285 @@
+"""Benchmark suite for the document-processing hot paths.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 50,200] [--concurrency 1,4,16]
+        [--requests 40] [--llm-latency 0.2] [--winston-latency 0.1]
+        [--output results.json] [--compare baseline.json]
+
+For every corpus size a synthetic corpus with controlled overlap is written
+as TXT and PDF, the app is loaded in a scratch directory with the fake
+Gemini model and a local fake Winston server, and the following are
+measured:
+
+- extract_text_from_pdf, cold (empty text cache) and warm
+- get_matching_blocks on overlapping document pairs
+- check_local_plagiarism against the indexed corpus, per concurrency level
+- end-to-end POST / and POST /check_plagiarism (local and online), per
+  concurrency level
+
+Each result reports throughput, p50/p95/p99 latency and peak Python heap
+memory (tracemalloc, main process only). tracemalloc slows Python code
+considerably, so compare latency between runs made with the same
+--no-memory setting. Results are printed as a table and
+optionally written as JSON; --compare prints the change against an earlier
+JSON run.
+"""
+import argparse
+import datetime
+import io
+import json
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+from corpus import generate_corpus, write_corpus  # noqa: E402
+from fakes import FakeWinstonServer, fake_model_factory  # noqa: E402
+
+FEATURES = ("summarize", "feedback", "extract", "questions", "grading")
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def measure(fn, calls, concurrency=1, track_memory=True):
+    """Run ``fn(*args)`` for every args tuple in ``calls`` on ``concurrency`` threads."""
+    latencies = []
+
+    def run(args):
+        started = time.perf_counter()
+        fn(*args)
+        latencies.append(time.perf_counter() - started)
+
+    if track_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    if concurrency == 1:
+        for args in calls:
+            run(args)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(run, calls))
+    wall = time.perf_counter() - started
+    peak = None
+    if track_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return latencies, wall, peak
+
+
+def summarize(name, params, latencies, wall, peak):
+    def ms(value):
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        "name": name,
+        "params": params,
+        "count": len(latencies),
+        "wall_seconds": round(wall, 4),
+        "throughput_per_second": round(len(latencies) / wall, 3) if wall else None,
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else None,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "peak_memory_mb": round(peak / (1024 * 1024), 3) if peak is not None else None,
+    }
+
+
+def load_app(workdir, winston_url, llm_latency):
+    """Import the app with its upload and data folders inside ``workdir``."""
+    os.chdir(workdir)
+    os.environ["WINSTON_API_URL"] = winston_url
+    os.environ.setdefault("RESPONSE_CACHE_BACKEND", "memory")
+    import app as app_module
+    app_module.app.config["MODEL_FACTORY"] = fake_model_factory(first_token_latency=llm_latency)
+    return app_module
+
+
+def reset_state(app_module, workdir, tag):
+    """Give the app empty caches, document records and plagiarism index."""
+    from documents import DocumentStore
+    from online_plagiarism import OnlinePlagiarismChecker
+    from plagiarism_index import PlagiarismIndex
+    from response_cache import MemoryResponseCache
+    from text_cache import TextCache
+
+    state = os.path.join(workdir, "state", tag)
+    app_module.response_cache = MemoryResponseCache(max_entries=100000)
+    app_module.text_cache = TextCache(os.path.join(state, "text_cache"))
+    app_module.plagiarism_index = PlagiarismIndex(os.path.join(state, "index.db"))
+    app_module._plagiarism_index_synced = False
+    app_module.document_store = DocumentStore(
+        app_module.app.config["UPLOAD_FOLDER"], os.path.join(state, "documents.db")
+    )
+    checker = app_module.online_checker
+    app_module.online_checker = OnlinePlagiarismChecker(
+        checker.client, MemoryResponseCache(max_entries=100000),
+        concurrency=checker.concurrency, min_chars=checker.min_chars
+    )
+
+
+def bench_corpus(app_module, workdir, size, args):
+    results = []
+    upload_folder = app_module.app.config["UPLOAD_FOLDER"]
+    shutil.rmtree(upload_folder, ignore_errors=True)
+    os.makedirs(upload_folder)
+    documents = generate_corpus(size, paragraphs=args.paragraphs, overlap=args.overlap, seed=args.seed)
+    corpus_folder = os.path.join(workdir, f"corpus_{size}")
+    paths = write_corpus(documents, corpus_folder)
+    texts = ["\n\n".join(document) for document in documents]
+    sample = list(range(min(size, args.requests)))
+    track = not args.no_memory
+
+    reset_state(app_module, workdir, f"{size}_pdf")
+    pdfs = [(paths["pdf"][i],) for i in sample]
+    results.append(summarize("extract_text_from_pdf_cold", {"corpus": size},
+                             *measure(app_module.extract_text_from_pdf, pdfs, track_memory=track)))
+    results.append(summarize("extract_text_from_pdf_warm", {"corpus": size},
+                             *measure(app_module.extract_text_from_pdf, pdfs, track_memory=track)))
+
+    pairs = [(texts[i], texts[i - 1]) for i in sample if i > 0]
+    results.append(summarize("get_matching_blocks", {"corpus": size},
+                             *measure(app_module.get_matching_blocks, pairs, track_memory=track)))
+
+    reset_state(app_module, workdir, f"{size}_local")
+    for path in paths["txt"]:
+        shutil.copy(path, upload_folder)
+    latencies, wall, peak = measure(app_module.sync_plagiarism_index, [()], track_memory=track)
+    results.append(summarize("plagiarism_index_build", {"corpus": size}, latencies, wall, peak))
+    uploaded = [(os.path.join(upload_folder, os.path.basename(paths["txt"][i])),) for i in sample]
+    for concurrency in args.concurrency:
+        results.append(summarize(
+            "check_local_plagiarism", {"corpus": size, "concurrency": concurrency},
+            *measure(app_module.check_local_plagiarism, uploaded, concurrency, track)
+        ))
+
+    client_app = app_module.app
+    for concurrency in args.concurrency:
+        reset_state(app_module, workdir, f"{size}_home_{concurrency}")
+        app_module._plagiarism_index_synced = True
+
+        def post_home(i, concurrency=concurrency):
+            fmt = "pdf" if i % 2 else "txt"
+            with open(paths[fmt][i], "rb") as f:
+                data = f.read()
+            name = f"home_c{concurrency}_{i}.{fmt}"
+            client_app.test_client().post("/", data={
+                "feature": FEATURES[i % len(FEATURES)],
+                "file": (io.BytesIO(data), name)
+            })
+
+        results.append(summarize("POST /", {"corpus": size, "concurrency": concurrency},
+                                 *measure(post_home, [(i,) for i in sample], concurrency, track)))
+
+        for check_type in ("local", "online"):
+            def post_check(i, check_type=check_type):
+                client_app.test_client().post("/check_plagiarism", data={
+                    "check_type": check_type,
+                    "content": texts[i]
+                })
+
+            results.append(summarize(
+                f"POST /check_plagiarism ({check_type})", {"corpus": size, "concurrency": concurrency},
+                *measure(post_check, [(i,) for i in sample], concurrency, track)
+            ))
+    return results
+
+
+def result_key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def print_table(results, baseline=None):
+    baseline = {result_key(result): result for result in (baseline or [])}
+    header = f"{'benchmark':<38} {'params':<28} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak MB':>8}"
+    if baseline:
+        header += f" {'Δp50':>8} {'Δops/s':>8}"
+    print(header)
+    for result in results:
+        params = ",".join(f"{k}={v}" for k, v in result["params"].items())
+        line = (
+            f"{result['name']:<38} {params:<28} {result['throughput_per_second'] or 0:>9.2f} "
+            f"{result['p50_ms'] or 0:>9.2f} {result['p95_ms'] or 0:>9.2f} {result['p99_ms'] or 0:>9.2f} "
+            f"{result['peak_memory_mb'] if result['peak_memory_mb'] is not None else float('nan'):>8.2f}"
+        )
+        previous = baseline.get(result_key(result))
+        if previous:
+            def change(new, old):
+                return f"{(new - old) / old * 100:+.1f}%" if new is not None and old else "-"
+            line += (f" {change(result['p50_ms'], previous['p50_ms']):>8}"
+                     f" {change(result['throughput_per_second'], previous['throughput_per_second']):>8}")
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the document-processing hot paths.")
+    parser.add_argument("--sizes", default="50,200", help="comma-separated corpus sizes")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=40, help="requests per measurement")
+    parser.add_argument("--paragraphs", type=int, default=8, help="paragraphs per document")
+    parser.add_argument("--overlap", type=float, default=0.2, help="share of copied paragraphs")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="fake model latency in seconds")
+    parser.add_argument("--winston-latency", type=float, default=0.1, help="fake Winston latency in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc peak memory tracking")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch directory")
+    args = parser.parse_args()
+    args.sizes = [int(value) for value in args.sizes.split(",")]
+    args.concurrency = [int(value) for value in args.concurrency.split(",")]
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    workdir = tempfile.mkdtemp(prefix="genai-bench-")
+    cwd = os.getcwd()
+    results = []
+    try:
+        with FakeWinstonServer(latency=args.winston_latency) as winston:
+            app_module = load_app(workdir, winston.url, args.llm_latency)
+            for size in args.sizes:
+                results.extend(bench_corpus(app_module, workdir, size, args))
+            app_module.comparison_engine.shutdown()
+            app_module.pdf_extractor.shutdown()
+    finally:
+        os.chdir(cwd)
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_table(results, baseline)
+    if output:
+        report = {
+            "meta": {
+                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "args": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+            },
+            "results": results,
+        }
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
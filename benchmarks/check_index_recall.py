@@ -0,0 +1,77 @@
+"""Check that the LSH plagiarism index finds the sources the scorer would flag.
+
+Usage: python benchmarks/check_index_recall.py [--pairs 200] [--overlaps 0.1,0.2,0.3]
+    [--min-recall 0.95]
+
+For each overlap level, ``--pairs`` source documents are indexed and a
+submission is built from each by copying that share of its paragraphs into
+otherwise new text. A pair counts when the exact scorer (compare_pair, the
+same check local plagiarism reports use) flags it; recall is the share of
+those pairs whose source the index returns as a candidate, which is what an
+exhaustive scan over every upload would find. Exits with status 1 if recall
+at any level is below --min-recall.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from comparison import compare_pair  # noqa: E402
+from corpus import random_paragraph  # noqa: E402
+from plagiarism_index import PlagiarismIndex  # noqa: E402
+
+
+def make_pairs(rng, count, overlap, paragraphs=20):
+    """Return (source, submission) pairs with ``overlap`` of the paragraphs copied."""
+    pairs = []
+    copied = max(1, round(paragraphs * overlap))
+    for _ in range(count):
+        source = [random_paragraph(rng) for _ in range(paragraphs)]
+        submission = [random_paragraph(rng) for _ in range(paragraphs - copied)]
+        for paragraph in rng.sample(source, copied):
+            submission.insert(rng.randint(0, len(submission)), paragraph)
+        pairs.append(("\n\n".join(source), "\n\n".join(submission)))
+    return pairs
+
+
+def measure_recall(pairs, folder):
+    index = PlagiarismIndex(os.path.join(folder, "index.db"))
+    for i, (source, _) in enumerate(pairs):
+        index.add(f"source{i}", source)
+    flagged = found = 0
+    for i, (source, submission) in enumerate(pairs):
+        if not compare_pair(submission, f"source{i}", source):
+            continue
+        flagged += 1
+        if f"source{i}" in index.query(submission):
+            found += 1
+    return flagged, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure LSH candidate recall against the exact scorer.")
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--overlaps", default="0.1,0.2,0.3", help="comma-separated copied shares")
+    parser.add_argument("--min-recall", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failed = False
+    for overlap in (float(value) for value in args.overlaps.split(",")):
+        with tempfile.TemporaryDirectory() as folder:
+            flagged, found = measure_recall(make_pairs(rng, args.pairs, overlap), folder)
+        recall = found / flagged if flagged else 1.0
+        status = "ok" if recall >= args.min_recall else "FAIL"
+        print(f"overlap={overlap:.2f} flagged={flagged} found={found} recall={recall:.3f} {status}")
+        failed = failed or recall < args.min_recall
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
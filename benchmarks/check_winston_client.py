@@ -0,0 +1,58 @@
+"""Check the pooled Winston client against a local fake server.
+
+Usage: python benchmarks/check_winston_client.py [--requests 20]
+
+Verifies that sequential checks reuse one keep-alive connection and that a
+read timeout is not retried, since a retried POST may be billed twice.
+Exits with status 1 if either check fails.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+
+from clients import ConcurrencyLimiter, WinstonClient, create_session  # noqa: E402
+from fakes import FakeWinstonServer  # noqa: E402
+
+
+def check_connection_reuse(count):
+    with FakeWinstonServer() as server:
+        client = WinstonClient(server.url, None, create_session(), ConcurrencyLimiter(4))
+        for i in range(count):
+            client.check(f"passage {i}")
+        return len(server.requests), len(server.connections)
+
+
+def check_read_timeout(timeout):
+    with FakeWinstonServer(latency=timeout * 4) as server:
+        client = WinstonClient(
+            server.url, None, create_session(max_retries=3), ConcurrencyLimiter(4), timeout=(1, timeout)
+        )
+        try:
+            client.check("slow passage")
+        except requests.exceptions.ConnectionError:
+            pass
+        return len(server.requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check Winston client connection reuse and retries.")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--read-timeout", type=float, default=0.2)
+    args = parser.parse_args()
+
+    sent, connections = check_connection_reuse(args.requests)
+    reuse_ok = sent == args.requests and connections == 1
+    print(f"connection reuse: {sent} requests over {connections} connection(s) {'ok' if reuse_ok else 'FAIL'}")
+
+    attempts = check_read_timeout(args.read_timeout)
+    timeout_ok = attempts == 1
+    print(f"read timeout: {attempts} attempt(s) {'ok' if timeout_ok else 'FAIL'}")
+    sys.exit(0 if reuse_ok and timeout_ok else 1)
+
+
+if __name__ == "__main__":
+    main()
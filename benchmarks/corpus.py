@@ -0,0 +1,116 @@
+"""Synthetic document corpus for the benchmarks.
+
+Documents are built from random sentences over a fixed vocabulary. A
+controlled fraction of each document is copied from earlier documents in
+the corpus, so plagiarism checks have real matches to find. Every document
+can be written both as plain text and as a minimal multi-page PDF.
+"""
+import os
+import random
+
+VOCABULARY = (
+    "analysis data model system learning energy climate policy network results method "
+    "study urban design process impact research theory values growth market signal "
+    "student report evidence approach framework sample survey outcome factor region "
+    "the of and to in is for with on as by that this from are be which"
+).split()
+
+
+def random_sentence(rng, min_words=8, max_words=20):
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + "."
+
+
+def random_paragraph(rng, sentences=5):
+    return " ".join(random_sentence(rng) for _ in range(sentences))
+
+
+def generate_corpus(count, paragraphs=8, overlap=0.2, seed=0):
+    """Return ``count`` documents (lists of paragraphs) with roughly ``overlap`` copied text."""
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(count):
+        document = []
+        for _ in range(paragraphs):
+            if documents and rng.random() < overlap:
+                source = rng.choice(documents)
+                document.append(rng.choice(source))
+            else:
+                document.append(random_paragraph(rng))
+        documents.append(document)
+    return documents
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(text, width=90):
+    line = []
+    length = 0
+    for word in text.split():
+        if line and length + len(word) + 1 > width:
+            yield " ".join(line)
+            line = []
+            length = 0
+        line.append(word)
+        length += len(word) + 1
+    if line:
+        yield " ".join(line)
+
+
+def render_pdf(pages):
+    """Render a list of page texts as a minimal PDF using the Helvetica base font."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        lines = []
+        for paragraph in text.split("\n\n"):
+            lines.extend(_wrap(paragraph))
+            lines.append("")
+        stream = "BT /F1 10 Tf 12 TL 50 750 Td " + " ".join(
+            f"({_pdf_escape(line)}) Tj T*" for line in lines
+        ) + " ET"
+        content_id = len(objects) + 2
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode()
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(output)
+
+
+def write_corpus(documents, folder, formats=("txt", "pdf"), paragraphs_per_page=3, prefix="doc"):
+    """Write documents to ``folder`` and return the paths written, per format."""
+    os.makedirs(folder, exist_ok=True)
+    paths = {fmt: [] for fmt in formats}
+    for i, document in enumerate(documents):
+        name = f"{prefix}{i:05d}"
+        if "txt" in formats:
+            path = os.path.join(folder, f"{name}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n\n".join(document))
+            paths["txt"].append(path)
+        if "pdf" in formats:
+            pages = [
+                "\n\n".join(document[start:start + paragraphs_per_page])
+                for start in range(0, len(document), paragraphs_per_page)
+            ]
+            path = os.path.join(folder, f"{name}.pdf")
+            with open(path, "wb") as f:
+                f.write(render_pdf(pages))
+            paths["pdf"].append(path)
+    return paths
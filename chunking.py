@@ -0,0 +1,103 @@
+import re
+
+PAGE_BREAK = "\f"
+PARAGRAPH_RE = re.compile(r"\n\s*\n")
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n")
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """Cheap local token estimate (roughly four characters per token)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _split_oversized(text, max_tokens):
+    pieces = []
+    current = ""
+    for sentence in SENTENCE_RE.split(text):
+        if not sentence:
+            continue
+        if estimate_tokens(sentence) > max_tokens:
+            if current:
+                pieces.append(current)
+                current = ""
+            words = sentence.split(" ")
+            for word in words:
+                candidate = f"{current} {word}" if current else word
+                if current and estimate_tokens(candidate) > max_tokens:
+                    pieces.append(current)
+                    candidate = word
+                current = candidate
+            continue
+        candidate = f"{current} {sentence}" if current else sentence
+        if current and estimate_tokens(candidate) > max_tokens:
+            pieces.append(current)
+            candidate = sentence
+        current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def iter_paragraphs(pages, max_tokens):
+    """Yield paragraphs from page texts, splitting any that exceed the budget."""
+    for page in pages:
+        for paragraph in PARAGRAPH_RE.split(page):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if estimate_tokens(paragraph) > max_tokens:
+                yield from _split_oversized(paragraph, max_tokens)
+            else:
+                yield paragraph
+
+
+class ChunkPacker:
+    """Packs page texts into chunks of at most ``max_tokens`` estimated tokens.
+
+    Pages are fed in one at a time and every chunk is returned as soon as it
+    is full, so a caller can start work on the first chunks while later
+    pages are still being read. ``close`` returns whatever is left.
+    """
+
+    def __init__(self, max_tokens):
+        self.max_tokens = max_tokens
+        self._current = []
+        self._current_tokens = 0
+
+    def feed(self, page):
+        chunks = []
+        for unit in iter_paragraphs([page], self.max_tokens):
+            unit_tokens = estimate_tokens(unit) + 1
+            if self._current and self._current_tokens + unit_tokens > self.max_tokens:
+                chunks.append("\n\n".join(self._current))
+                self._current = []
+                self._current_tokens = 0
+            self._current.append(unit)
+            self._current_tokens += unit_tokens
+        return chunks
+
+    def close(self):
+        chunks = ["\n\n".join(self._current)] if self._current else []
+        self._current = []
+        self._current_tokens = 0
+        return chunks
+
+
+def iter_chunks(pages, max_tokens):
+    """Yield chunks of at most ``max_tokens`` estimated tokens from page texts.
+
+    Pages and paragraphs are kept whole where they fit; only a paragraph that
+    is larger than the budget on its own is cut further, first on sentence
+    and then on word boundaries. Chunks are yielded as soon as they are full,
+    so pages can be consumed lazily while a document is still being read.
+    """
+    packer = ChunkPacker(max_tokens)
+    for page in pages:
+        yield from packer.feed(page)
+    yield from packer.close()
+
+
+def split_into_chunks(text, max_tokens):
+    """Split text whose pages are separated by form feeds into chunks."""
+    return list(iter_chunks(text.split(PAGE_BREAK), max_tokens))
@@ -0,0 +1,120 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class UpstreamBusyError(Exception):
+    """Raised when a call cannot get a slot on an upstream limiter in time."""
+
+
+class ConcurrencyLimiter:
+    """Caps concurrent calls to an upstream and, optionally, its request rate.
+
+    Callers wait at most ``acquire_timeout`` seconds for a slot and get an
+    ``UpstreamBusyError`` after that, so a slow upstream sheds load instead
+    of piling up blocked threads.
+    """
+
+    def __init__(self, max_concurrent, requests_per_minute=None, acquire_timeout=None):
+        self.max_concurrent = max_concurrent
+        self.requests_per_minute = requests_per_minute
+        self.acquire_timeout = acquire_timeout
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def _wait_for_rate(self, deadline):
+        if not self.requests_per_minute:
+            return
+        interval = 60.0 / self.requests_per_minute
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            if deadline is not None and start > deadline:
+                raise UpstreamBusyError("Upstream request rate limit reached")
+            self._next_start = start + interval
+        time.sleep(max(0.0, start - now))
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.acquire_timeout if self.acquire_timeout else None
+        if not self._semaphore.acquire(timeout=self.acquire_timeout):
+            raise UpstreamBusyError("Too many concurrent upstream requests")
+        try:
+            self._wait_for_rate(deadline)
+        except Exception:
+            self._semaphore.release()
+            raise
+        return self
+
+    def __exit__(self, *exc_info):
+        self._semaphore.release()
+        return False
+
+
+def create_session(pool_size=10, max_retries=3, backoff_factor=0.5):
+    """Return a keep-alive ``requests.Session`` with a sized pool and retries.
+
+    Connection failures and retryable statuses are retried, read timeouts
+    are not: the request may already have been processed (and billed), and
+    retrying would hold a limiter slot for several more timeouts.
+    """
+    retry = Retry(
+        total=max_retries,
+        read=0,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class ModelClient:
+    """Shares one model object per (factory, model name) and limits concurrent calls."""
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def get(self, factory, model_name):
+        key = (factory, model_name)
+        model = self._models.get(key)
+        if model is None:
+            with self._lock:
+                model = self._models.get(key)
+                if model is None:
+                    model = self._models[key] = factory(model_name)
+        return model
+
+    def generate(self, factory, model_name, prompt, **kwargs):
+        model = self.get(factory, model_name)
+        with self.limiter:
+            return model.generate_content(prompt, **kwargs)
+
+
+class WinstonClient:
+    """Client for the Winston AI plagiarism API over a pooled session."""
+
+    def __init__(self, url, api_key, session, limiter, timeout=(5, 60)):
+        self.url = url
+        self.api_key = api_key
+        self.session = session
+        self.limiter = limiter
+        self.timeout = timeout
+
+    def check(self, text, language="en", country="us"):
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = self.api_key
+        payload = {"text": text, "language": language, "country": country}
+        with self.limiter:
+            response = self.session.post(self.url, json=payload, headers=headers, timeout=self.timeout)
+        return response.json()
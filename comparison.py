@@ -0,0 +1,115 @@
+import math
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from matching import match_documents
+
+
+def process_context():
+    """Multiprocessing context for worker pools that is safe to use from a threaded server."""
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def get_matching_blocks(text1, text2, context_length=50):
+    return match_documents(text1, text2, context_length=context_length)[1]
+
+
+def compare_pair(current_content, name, other_content):
+    """Score one document against the submission, or return None if it does not match."""
+    similarity, matched_blocks = match_documents(current_content, other_content)
+
+    if similarity > 0.1 and matched_blocks:
+        return {
+            'file': name,
+            'similarity': round(similarity * 100, 2),
+            'matched_content': matched_blocks
+        }
+    return None
+
+
+def compare_batch(current_content, documents):
+    results = []
+    for name, other_content in documents:
+        try:
+            result = compare_pair(current_content, name, other_content)
+            if result:
+                results.append(result)
+        except Exception as e:
+            print(f"Error comparing with {name}: {e}")
+    return results
+
+
+class ComparisonEngine:
+    """Fans pairwise document comparisons out across a process pool.
+
+    Documents are grouped into batches so each worker task amortises the
+    cost of shipping the submission text, and results are merged in order of
+    similarity. A time budget bounds how long a check may take; when it runs
+    out, whatever has finished is returned and the check is marked partial.
+    At most one batch per worker is submitted at a time, so a check that
+    runs out of time leaves no more than that behind in the pool.
+
+    Workers are started from a forkserver (spawn where that is unavailable)
+    rather than forked from the multithreaded web process.
+    """
+
+    def __init__(self, workers=None, batches_per_worker=4, min_parallel=2):
+        self.workers = workers or os.cpu_count() or 1
+        self.batches_per_worker = batches_per_worker
+        self.min_parallel = min_parallel
+        self._executor = None
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=process_context())
+        return self._executor
+
+    def _batches(self, documents):
+        size = max(1, math.ceil(len(documents) / (self.workers * self.batches_per_worker)))
+        return [documents[i:i + size] for i in range(0, len(documents), size)]
+
+    def compare(self, current_content, documents, time_budget=None):
+        """Compare against (name, text) pairs; return (results, complete)."""
+        deadline = time.monotonic() + time_budget if time_budget else None
+        if self.workers <= 1 or len(documents) < self.min_parallel:
+            results = []
+            for batch in self._batches(documents):
+                if deadline and time.monotonic() > deadline:
+                    return self._merge(results), False
+                results.extend(compare_batch(current_content, batch))
+            return self._merge(results), True
+
+        batches = deque(self._batches(documents))
+        pending = set()
+        results = []
+        while batches or pending:
+            while batches and len(pending) < self.workers and not (deadline and time.monotonic() > deadline):
+                pending.add(self.executor.submit(compare_batch, current_content, batches.popleft()))
+            if not pending:
+                break
+            timeout = max(0, deadline - time.monotonic()) if deadline else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                try:
+                    results.extend(future.result())
+                except Exception as e:
+                    print(f"Error in comparison worker: {e}")
+        for future in pending:
+            future.cancel()
+        return self._merge(results), not (pending or batches)
+
+    @staticmethod
+    def _merge(results):
+        return sorted(results, key=lambda result: result['similarity'], reverse=True)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
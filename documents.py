@@ -0,0 +1,132 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from array import array
+from contextlib import closing
+
+
+class DocumentStore:
+    """Content-addressed store of uploaded documents and their ingest records.
+
+    Uploads are streamed into ``folder`` while being hashed and kept as
+    ``<sha256><ext>``, so the same content is stored once however often and
+    under whatever names it is uploaded. Ingest metadata (page count,
+    length, MinHash signature) is recorded per stored file, keyed by its
+    name and checked against its mtime and size, so each file is only
+    fingerprinted and indexed once. The text itself is not kept here; PDF
+    text lives in the size-bounded TextCache. Records made with another
+    ``signature_version`` are dropped on open.
+    """
+
+    def __init__(self, folder, db_path, signature_version=None):
+        self.folder = folder
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(folder, exist_ok=True)
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(documents)")}
+            if "text" in columns:
+                # Records used to hold the full text; they are rebuilt on demand
+                conn.execute("DROP TABLE documents")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "name TEXT PRIMARY KEY, size INTEGER, mtime REAL, pages INTEGER, "
+                "characters INTEGER, signature BLOB, created_at REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS uploads ("
+                "name TEXT, filename TEXT, uploaded_at REAL, PRIMARY KEY (name, filename))"
+            )
+            if signature_version is not None:
+                conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+                row = conn.execute("SELECT value FROM meta WHERE key = 'signature_version'").fetchone()
+                if row is None or row[0] != signature_version:
+                    # Signatures from another scheme cannot be compared with the index
+                    conn.execute("DELETE FROM documents")
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('signature_version', ?)",
+                        (signature_version,),
+                    )
+
+    def _connect(self):
+        return closing(sqlite3.connect(self.db_path, timeout=30, isolation_level=None))
+
+    def save(self, stream, filename, chunk_size=1 << 20):
+        """Write an upload stream to the store and return the path of the stored file."""
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, prefix="temp_", suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while chunk := stream.read(chunk_size):
+                    digest.update(chunk)
+                    f.write(chunk)
+            name = f"{digest.hexdigest()}{os.path.splitext(filename)[1].lower()}"
+            file_path = os.path.join(self.folder, name)
+            if os.path.exists(file_path):
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO uploads (name, filename, uploaded_at) VALUES (?, ?, ?)",
+                (name, filename or name, time.time()),
+            )
+        return file_path
+
+    def filenames(self, name):
+        """Return the names a stored file was uploaded under, most recent last."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT filename FROM uploads WHERE name = ? ORDER BY uploaded_at", (name,)
+            )
+            return [row[0] for row in rows]
+
+    def get(self, name, mtime, size):
+        """Return the ingest record of a stored file, or None if missing or stale."""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM documents WHERE name = ?", (name,)).fetchone()
+        with self._lock:
+            if row is None or row["mtime"] != mtime or row["size"] != size:
+                self.misses += 1
+                return None
+            self.hits += 1
+        record = dict(row)
+        if record["signature"]:
+            signature = array("Q")
+            signature.frombytes(record["signature"])
+            record["signature"] = list(signature)
+        return record
+
+    def put(self, name, characters, pages, signature, mtime, size):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO documents "
+                "(name, size, mtime, pages, characters, signature, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, size, mtime, pages, characters,
+                 array("Q", signature).tobytes() if signature else None, time.time()),
+            )
+
+    def stats(self):
+        with self._connect() as conn:
+            documents, characters = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(characters), 0) FROM documents"
+            ).fetchone()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "documents": documents,
+                "characters": characters,
+            }
@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeResponse:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    @property
+    def text(self):
+        return "".join(chunk.text for chunk in self._chunks)
+
+    def __iter__(self):
+        return iter(self._chunks)
+
+
+class FakeStreamingResponse:
+    def __init__(self, chunks, first_token_latency, token_latency):
+        self._chunks = chunks
+        self._first_token_latency = first_token_latency
+        self._token_latency = token_latency
+        self._text = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = "".join(chunk.text for chunk in self)
+        return self._text
+
+    def __iter__(self):
+        for i, chunk in enumerate(self._chunks):
+            time.sleep(self._first_token_latency if i == 0 else self._token_latency)
+            yield chunk
+
+
+class FakeGenerativeModel:
+    """Local stand-in for ``genai.GenerativeModel``.
+
+    Answers every prompt with a deterministic echo of its tail, split into
+    word-sized chunks, and simulates first-token and per-token latency so
+    streaming and caching paths can be exercised without network access.
+    """
+
+    def __init__(self, model_name="fake-model", first_token_latency=0.0,
+                 token_latency=0.0, response_text=None):
+        self.model_name = model_name
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.response_text = response_text
+        self.prompts = []
+
+    def _chunks(self, prompt):
+        text = self.response_text
+        if text is None:
+            text = f"[{self.model_name}] " + " ".join(prompt.split()[-20:])
+        words = text.split(" ")
+        return [FakeChunk(word if i == 0 else " " + word) for i, word in enumerate(words)]
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.prompts.append(prompt)
+        chunks = self._chunks(prompt)
+        if stream:
+            return FakeStreamingResponse(chunks, self.first_token_latency, self.token_latency)
+        time.sleep(self.first_token_latency + self.token_latency * max(len(chunks) - 1, 0))
+        return FakeResponse(chunks)
+
+
+def fake_model_factory(**options):
+    """Return a ``MODEL_FACTORY`` that builds fake models with fixed options."""
+    def factory(model_name):
+        return FakeGenerativeModel(model_name, **options)
+    return factory
+
+
+class FakeWinstonServer:
+    """Local HTTP stand-in for the Winston AI plagiarism endpoint.
+
+    Scores a submission by the share of its words found in ``known_text``
+    and answers after ``latency`` seconds. Use it as a context manager and
+    point ``WINSTON_API_URL`` (or a ``WinstonClient``) at ``server.url``.
+    """
+
+    def __init__(self, latency=0.0, known_text="", host="127.0.0.1", port=0):
+        self.latency = latency
+        self.known_words = set(known_text.lower().split())
+        self.requests = []
+        self.connections = set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                server.requests.append(payload)
+                server.connections.add(self.client_address)
+                time.sleep(server.latency)
+                body = json.dumps({"result": {"score": server.score(payload.get("text", ""))}}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v2/plagiarism"
+
+    def score(self, text):
+        words = text.lower().split()
+        if not words:
+            return 0
+        return round(100 * sum(1 for word in words if word in self.known_words) / len(words), 2)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
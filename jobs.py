@@ -0,0 +1,162 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobQueue:
+    """Background job queue backed by a local thread pool and SQLite.
+
+    Job parameters, status, progress and results are persisted, so finished
+    jobs stay queryable after a restart. Every unfinished job is leased by
+    the queue instance that runs it, which renews the lease while it is
+    alive; ``resume()`` only takes over jobs whose lease has expired, so
+    several processes can share one database without running a job twice.
+    """
+
+    def __init__(self, db_path, workers=4, lease_seconds=60):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._heartbeat = None
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT, status TEXT, params TEXT, progress TEXT, "
+                "result TEXT, error TEXT, created_at REAL, started_at REAL, finished_at REAL, "
+                "owner TEXT, lease_until REAL)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+
+    def _connect(self):
+        return closing(sqlite3.connect(self.db_path, timeout=30, isolation_level=None))
+
+    def _update(self, job_id, **fields):
+        """Update a job this instance holds; does nothing once another instance took it over."""
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"UPDATE jobs SET {columns} WHERE id = ? AND owner = ?",
+                (*fields.values(), job_id, self.owner),
+            )
+
+    def register(self, kind, handler):
+        """Register ``handler(params, progress)`` to run jobs of the given kind."""
+        self._handlers[kind] = handler
+
+    def submit(self, kind, params):
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, params, created_at, owner, lease_until) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, json.dumps(params), time.time(), self.owner,
+                 time.time() + self.lease_seconds),
+            )
+        self._start_heartbeat()
+        self._executor.submit(self._run, job_id, kind, params)
+        return job_id
+
+    def _run(self, job_id, kind, params):
+        self._update(job_id, status=RUNNING, started_at=time.time())
+
+        def progress(**data):
+            self._update(job_id, progress=json.dumps(data))
+
+        try:
+            result = self._handlers[kind](params, progress)
+            self._update(job_id, status=SUCCEEDED, result=json.dumps(result), finished_at=time.time())
+        except Exception as e:
+            print(f"Error running job {job_id}: {e}")
+            traceback.print_exc()
+            self._update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        for field in ("params", "progress", "result"):
+            job[field] = json.loads(job[field]) if job[field] is not None else None
+        return job
+
+    def _claim_expired(self):
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT id, kind, params FROM jobs WHERE status IN (?, ?) "
+                "AND (lease_until IS NULL OR lease_until < ?) ORDER BY created_at",
+                (QUEUED, RUNNING, now),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET status = ?, owner = ?, lease_until = ? WHERE id = ?",
+                ((QUEUED, self.owner, now + self.lease_seconds, row[0]) for row in rows),
+            )
+            conn.execute("COMMIT")
+        return rows
+
+    def _renew_leases(self):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE owner = ? AND status IN (?, ?)",
+                (time.time() + self.lease_seconds, self.owner, QUEUED, RUNNING),
+            )
+
+    def _heartbeat_loop(self):
+        while True:
+            time.sleep(self.lease_seconds / 3)
+            try:
+                self._renew_leases()
+                self._requeue(self._claim_expired())
+            except Exception as e:
+                print(f"Error renewing job leases: {e}")
+
+    def resume(self):
+        """Take over jobs whose lease expired and keep this instance's leases alive.
+
+        Call once at startup. Jobs of a process that stopped are picked up
+        here, or by the heartbeat once their lease runs out; jobs of live
+        sibling processes are left alone.
+        """
+        rows = self._claim_expired()
+        self._requeue(rows)
+        self._start_heartbeat()
+        return len(rows)
+
+    def _start_heartbeat(self):
+        with self._lock:
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True)
+                self._heartbeat.start()
+
+    def _requeue(self, rows):
+        for job_id, kind, params in rows:
+            if kind not in self._handlers:
+                self._update(job_id, status=FAILED, error=f"Unknown job kind: {kind}",
+                             finished_at=time.time())
+                continue
+            self._executor.submit(self._run, job_id, kind, json.loads(params))
@@ -0,0 +1,124 @@
+import re
+
+WORD_RE = re.compile(r"\w+")
+HASH_BASE = 1000003
+HASH_MOD = (1 << 61) - 1
+
+
+def tokenize(text):
+    """Return (lowercased word, start offset, end offset) for every word in text."""
+    return [(m.group().lower(), m.start(), m.end()) for m in WORD_RE.finditer(text)]
+
+
+def kgram_hashes(words, k):
+    """Karp-Rabin rolling hashes of every run of k consecutive words."""
+    if len(words) < k:
+        return []
+    ids = [hash(word) & HASH_MOD for word in words]
+    high = pow(HASH_BASE, k - 1, HASH_MOD)
+    value = 0
+    for word_id in ids[:k]:
+        value = (value * HASH_BASE + word_id) % HASH_MOD
+    hashes = [value]
+    for i in range(k, len(ids)):
+        value = ((value - ids[i - k] * high) * HASH_BASE + ids[i]) % HASH_MOD
+        hashes.append(value)
+    return hashes
+
+
+def winnow(hashes, window):
+    """Select fingerprints with the winnowing algorithm (rightmost minimum per window).
+
+    Returns a list of (hash, position) pairs. Any shared run of at least
+    ``window + k - 1`` words yields at least one shared fingerprint.
+    """
+    if len(hashes) <= window:
+        if not hashes:
+            return []
+        position = min(range(len(hashes)), key=lambda i: (hashes[i], -i))
+        return [(hashes[position], position)]
+    fingerprints = []
+    last = -1
+    for start in range(len(hashes) - window + 1):
+        position = start
+        for i in range(start + 1, start + window):
+            if hashes[i] <= hashes[position]:
+                position = i
+        if position != last:
+            fingerprints.append((hashes[position], position))
+            last = position
+    return fingerprints
+
+
+def find_passages(words1, words2, k=5, window=4, max_positions=16):
+    """Find maximal runs of identical words shared by two token lists.
+
+    Fingerprints of the second document are indexed; each fingerprint of the
+    first document that also occurs there seeds a match that is extended
+    word by word in both directions. Returns (start1, start2, length) tuples
+    in word units, ordered by position in the first document.
+    """
+    index = {}
+    for value, position in winnow(kgram_hashes(words2, k), window):
+        positions = index.setdefault(value, [])
+        if len(positions) < max_positions:
+            positions.append(position)
+
+    passages = []
+    diagonal_end = {}
+    for value, i in winnow(kgram_hashes(words1, k), window):
+        for j in index.get(value, ()):
+            diagonal = i - j
+            if i < diagonal_end.get(diagonal, -1):
+                continue
+            if words1[i:i + k] != words2[j:j + k]:
+                continue
+            start1, start2 = i, j
+            while start1 > 0 and start2 > 0 and words1[start1 - 1] == words2[start2 - 1]:
+                start1 -= 1
+                start2 -= 1
+            end1, end2 = i + k, j + k
+            while end1 < len(words1) and end2 < len(words2) and words1[end1] == words2[end2]:
+                end1 += 1
+                end2 += 1
+            diagonal_end[diagonal] = end1
+            passages.append((start1, start2, end1 - start1))
+    passages.sort()
+    return passages
+
+
+def match_documents(text1, text2, context_length=50, max_snippets=3, min_chars=20, k=5, window=4):
+    """Compute similarity and matched snippets for two texts in one pass.
+
+    Similarity is the share of words in both documents covered by shared
+    passages (the word-level analogue of ``SequenceMatcher.ratio()``).
+    Snippets are the longest passages, padded with ``context_length``
+    characters of the first text on either side and returned in document
+    order.
+    """
+    tokens1 = tokenize(text1)
+    tokens2 = tokenize(text2)
+    if not tokens1 or not tokens2:
+        return 0.0, []
+    words1 = [token[0] for token in tokens1]
+    words2 = [token[0] for token in tokens2]
+    passages = find_passages(words1, words2, k=k, window=window)
+
+    covered1 = bytearray(len(words1))
+    covered2 = bytearray(len(words2))
+    spans = []
+    for start1, start2, length in passages:
+        covered1[start1:start1 + length] = b"\x01" * length
+        covered2[start2:start2 + length] = b"\x01" * length
+        char_start = tokens1[start1][1]
+        char_end = tokens1[start1 + length - 1][2]
+        if char_end - char_start > min_chars:
+            spans.append((char_start, char_end))
+    similarity = (sum(covered1) + sum(covered2)) / (len(words1) + len(words2))
+
+    longest = sorted(spans, key=lambda span: span[1] - span[0], reverse=True)[:max_snippets]
+    snippets = [
+        text1[max(0, start - context_length):min(len(text1), end + context_length)]
+        for start, end in sorted(longest)
+    ]
+    return similarity, snippets
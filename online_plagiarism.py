@@ -0,0 +1,116 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from chunking import PAGE_BREAK, iter_paragraphs
+from response_cache import normalize_content
+
+
+def split_passages(text, min_chars=300, max_tokens=1000):
+    """Split text into paragraph-level passages for online checking.
+
+    Each paragraph becomes its own passage so that editing one paragraph of
+    a draft only invalidates that passage. Paragraphs shorter than
+    ``min_chars`` are merged with the following ones, since very short
+    texts are not scored reliably.
+    """
+    passages = []
+    pending = ""
+    for paragraph in iter_paragraphs(text.split(PAGE_BREAK), max_tokens):
+        pending = f"{pending}\n\n{paragraph}" if pending else paragraph
+        if len(pending) >= min_chars:
+            passages.append(pending)
+            pending = ""
+    if pending:
+        if passages:
+            passages[-1] = f"{passages[-1]}\n\n{pending}"
+        else:
+            passages.append(pending)
+    return passages
+
+
+def passage_key(passage, language, country):
+    payload = f"{language}:{country}:{normalize_content(passage)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class OnlinePlagiarismChecker:
+    """Checks text against the Winston API passage by passage.
+
+    Passages are hashed and looked up in a result cache first; only unseen
+    passages are sent to the API, concurrently. Per-passage scores are
+    combined into a document score weighted by passage length.
+    """
+
+    def __init__(self, client, cache, concurrency=4, min_chars=300, max_tokens=1000,
+                 language="en", country="us"):
+        self.client = client
+        self.cache = cache
+        self.concurrency = concurrency
+        self.min_chars = min_chars
+        self.max_tokens = max_tokens
+        self.language = language
+        self.country = country
+
+    def _check_passage(self, passage):
+        response_data = self.client.check(passage, language=self.language, country=self.country)
+        score = response_data.get("result", {}).get("score", None)
+        if score is None:
+            raise ValueError("Unable to retrieve score from the API response.")
+        sources = [
+            {"url": source.get("url"), "title": source.get("title"), "score": source.get("score")}
+            for source in response_data.get("sources", []) or []
+        ]
+        return {"score": score, "sources": sources}
+
+    def check(self, text):
+        passages = split_passages(text, self.min_chars, self.max_tokens)
+        if not passages:
+            return {"error": "No text to check"}
+
+        keys = [passage_key(passage, self.language, self.country) for passage in passages]
+        results = {}
+        for key in set(keys):
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[key] = dict(json.loads(cached), cached=True)
+        cached_count = len(results)
+
+        to_check = {key: passage for key, passage in zip(keys, passages) if key not in results}
+        errors = {}
+        if to_check:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(to_check))) as executor:
+                futures = {key: executor.submit(self._check_passage, passage)
+                           for key, passage in to_check.items()}
+                for key, future in futures.items():
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Error checking passage online: {e}")
+                        errors[key] = str(e)
+                        continue
+                    self.cache.set(key, json.dumps(result))
+                    results[key] = dict(result, cached=False)
+
+        report = []
+        weighted = 0.0
+        total = 0
+        for key, passage in zip(keys, passages):
+            entry = {"text": passage, "characters": len(passage)}
+            if key in results:
+                entry.update(results[key])
+                weighted += results[key]["score"] * len(passage)
+                total += len(passage)
+            else:
+                entry["error"] = errors.get(key, "Not checked")
+            report.append(entry)
+
+        if not total:
+            return {"error": next(iter(errors.values()), "Unable to check text"), "passages": report}
+        return {
+            "score": round(weighted / total, 2),
+            "passages": report,
+            "checked": len(to_check) - len(errors),
+            "cached": cached_count,
+            "failed": len(errors)
+        }
@@ -0,0 +1,109 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from PyPDF2 import PdfReader
+
+from comparison import process_context
+
+
+def _page_text(reader, number, file_path):
+    try:
+        return reader.pages[number].extract_text() or ""
+    except Exception as e:
+        print(f"Error extracting page {number + 1} of {file_path}: {e}")
+        return None
+
+
+def extract_page_range(file_path, start, end):
+    """Extract pages [start, end) of a PDF, returning (page number, text) pairs.
+
+    Pages that fail to extract are skipped rather than failing the range.
+    """
+    reader = PdfReader(file_path)
+    pages = []
+    for number in range(start, min(end, len(reader.pages))):
+        text = _page_text(reader, number, file_path)
+        if text is not None:
+            pages.append((number, text))
+    return pages
+
+
+class PdfExtractor:
+    """Lazily yields the text of a PDF page by page.
+
+    Small documents are read sequentially in-process. Larger ones are split
+    into page ranges that are extracted in worker processes, with at most
+    ``max_in_flight`` ranges outstanding so memory stays bounded no matter
+    how big the file is; pages are still yielded in order. Extraction stops
+    once ``max_chars`` characters have been produced, which is also what
+    bounds callers that need a document's whole text at once, such as the
+    plagiarism comparison.
+    """
+
+    def __init__(self, workers=None, pages_per_task=16, max_in_flight=None,
+                 parallel_min_pages=64, max_chars=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task
+        self.max_in_flight = max_in_flight or self.workers * 2
+        self.parallel_min_pages = parallel_min_pages
+        self.max_chars = max_chars
+        self._executor = None
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=process_context())
+        return self._executor
+
+    def _iter_sequential(self, file_path, reader):
+        for number in range(len(reader.pages)):
+            text = _page_text(reader, number, file_path)
+            if text is not None:
+                yield number, text
+
+    def _iter_parallel(self, file_path, page_count):
+        ranges = deque(
+            (start, start + self.pages_per_task)
+            for start in range(0, page_count, self.pages_per_task)
+        )
+        in_flight = deque()
+        try:
+            while ranges or in_flight:
+                while ranges and len(in_flight) < self.max_in_flight:
+                    start, end = ranges.popleft()
+                    in_flight.append(self.executor.submit(extract_page_range, file_path, start, end))
+                try:
+                    pages = in_flight.popleft().result()
+                except Exception as e:
+                    print(f"Error extracting page range of {file_path}: {e}")
+                    continue
+                yield from pages
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def iter_pages(self, file_path):
+        """Yield (page number, text) for every page that could be extracted."""
+        reader = PdfReader(file_path)
+        page_count = len(reader.pages)
+        if self.workers > 1 and page_count >= self.parallel_min_pages:
+            pages = self._iter_parallel(file_path, page_count)
+        else:
+            pages = self._iter_sequential(file_path, reader)
+
+        produced = 0
+        for number, text in pages:
+            if self.max_chars is not None and produced + len(text) > self.max_chars:
+                print(f"Stopping extraction of {file_path} at page {number + 1}: "
+                      f"text exceeds {self.max_chars} characters")
+                yield number, text[:self.max_chars - produced]
+                pages.close()
+                return
+            produced += len(text)
+            yield number, text
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,233 @@
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import threading
+from array import array
+from contextlib import closing
+
+WORD_RE = re.compile(r"\w+")
+EMPTY = 1 << 64
+
+
+def _hash64(data):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def _shingle_hashes(words, size):
+    return {
+        _hash64(" ".join(words[i:i + size]).encode("utf-8"))
+        for i in range(len(words) - size + 1)
+    }
+
+
+def shingles(text, size=3):
+    """Return the set of hashed word shingles for a piece of text."""
+    words = WORD_RE.findall(text.lower())
+    if not words:
+        return set()
+    if len(words) < size:
+        return {_hash64(" ".join(words).encode("utf-8"))}
+    return _shingle_hashes(words, size)
+
+
+class MinHasher:
+    """Builds a MinHash signature from text fed in successive pieces.
+
+    Uses one-permutation hashing: every shingle is hashed once, the hash
+    picks one of the signature's bins and the smallest remaining value per
+    bin is kept. Bins no shingle fell into borrow the value of the first
+    filled bin in a fixed probe order, so signatures of different documents
+    stay comparable position by position for banding.
+
+    The last ``size - 1`` words of each piece are carried over, so shingles
+    spanning a page boundary are counted exactly as if the text had been
+    hashed in one go.
+    """
+
+    def __init__(self, probes, size):
+        self._probes = probes
+        self._size = size
+        self._tail = []
+        self._bins = [EMPTY] * len(probes)
+        self._seen = False
+
+    def _add(self, bins, hashes):
+        for h in hashes:
+            value, i = divmod(h, len(bins))
+            if value < bins[i]:
+                bins[i] = value
+
+    def update(self, text):
+        words = self._tail + WORD_RE.findall(text.lower())
+        if len(words) < self._size:
+            self._tail = words
+            return
+        self._add(self._bins, _shingle_hashes(words, self._size))
+        self._seen = True
+        self._tail = words[len(words) - self._size + 1:]
+
+    def digest(self):
+        bins = self._bins
+        if not self._seen:
+            if not self._tail:
+                return None
+            bins = list(bins)
+            self._add(bins, [_hash64(" ".join(self._tail).encode("utf-8"))])
+        return [
+            value if value != EMPTY else next(bins[j] for j in probes if bins[j] != EMPTY)
+            for value, probes in zip(bins, self._probes)
+        ]
+
+
+class PlagiarismIndex:
+    """On-disk MinHash/LSH index of uploaded documents.
+
+    Every document is reduced to a MinHash signature over its word shingles and
+    the signature is split into bands. Documents sharing at least one band
+    bucket with a query are returned as candidates for exact comparison, so a
+    check only touches the handful of files that can plausibly match.
+
+    The default of one row per band makes a document a candidate with
+    probability ``1 - (1 - J) ** 128`` for shingle Jaccard similarity ``J``:
+    about 99.9% at J = 0.05, which is roughly what 10% of copied text (the
+    reporting threshold) gives. ``num_perm`` is the signature length; the
+    signature is built with a single hash per shingle (see MinHasher).
+    """
+
+    def __init__(self, db_path, num_perm=128, bands=128, shingle_size=3, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.db_path = db_path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.settings = f"oph:{num_perm}:{bands}:{shingle_size}:{seed}"
+        rng = random.Random(seed)
+        self._probes = []
+        for i in range(num_perm):
+            others = [j for j in range(num_perm) if j != i]
+            rng.shuffle(others)
+            self._probes.append(others)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "name TEXT PRIMARY KEY, mtime REAL, signature BLOB)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "band INTEGER, bucket INTEGER, name TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_buckets ON buckets (band, bucket)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_buckets_name ON buckets (name)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = conn.execute("SELECT value FROM meta WHERE key = 'settings'").fetchone()
+            if row is None or row[0] != self.settings:
+                # Buckets built with other settings never match; let sync() rebuild them
+                conn.execute("DELETE FROM buckets")
+                conn.execute("DELETE FROM documents")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('settings', ?)", (self.settings,)
+                )
+
+    def _connect(self):
+        return closing(sqlite3.connect(self.db_path, timeout=30, isolation_level=None))
+
+    def minhasher(self):
+        return MinHasher(self._probes, self.shingle_size)
+
+    def signature(self, text):
+        hasher = self.minhasher()
+        hasher.update(text)
+        return hasher.digest()
+
+    def _band_buckets(self, signature):
+        for band in range(self.bands):
+            rows = array("Q", signature[band * self.rows:(band + 1) * self.rows])
+            yield band, int.from_bytes(
+                hashlib.blake2b(rows.tobytes(), digest_size=8).digest(), "big", signed=True
+            )
+
+    def add(self, name, text=None, mtime=None, signature=None):
+        """Index (or re-index) a document by its text or a precomputed signature."""
+        if signature is None:
+            signature = self.signature(text or "")
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM buckets WHERE name = ?", (name,))
+            conn.execute("DELETE FROM documents WHERE name = ?", (name,))
+            conn.execute(
+                "INSERT INTO documents (name, mtime, signature) VALUES (?, ?, ?)",
+                (name, mtime, array("Q", signature).tobytes() if signature else None),
+            )
+            if signature:
+                conn.executemany(
+                    "INSERT INTO buckets (band, bucket, name) VALUES (?, ?, ?)",
+                    ((band, bucket, name) for band, bucket in self._band_buckets(signature)),
+                )
+            conn.execute("COMMIT")
+
+    def remove(self, name):
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM buckets WHERE name = ?", (name,))
+            conn.execute("DELETE FROM documents WHERE name = ?", (name,))
+            conn.execute("COMMIT")
+
+    def documents(self):
+        """Return a mapping of indexed document names to their recorded mtime."""
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT name, mtime FROM documents"))
+
+    def query(self, text, exclude=None, signature=None):
+        """Return candidate document names ordered by estimated Jaccard similarity.
+
+        Pass ``signature`` when it is already known to skip hashing ``text``.
+        """
+        if signature is None:
+            signature = self.signature(text or "")
+        if not signature:
+            return []
+        with self._connect() as conn:
+            names = set()
+            for band, bucket in self._band_buckets(signature):
+                names.update(
+                    row[0] for row in conn.execute(
+                        "SELECT name FROM buckets WHERE band = ? AND bucket = ?", (band, bucket)
+                    )
+                )
+            names.discard(exclude)
+            scored = []
+            for name in names:
+                row = conn.execute(
+                    "SELECT signature FROM documents WHERE name = ?", (name,)
+                ).fetchone()
+                if not row or not row[0]:
+                    continue
+                other = array("Q")
+                other.frombytes(row[0])
+                estimate = sum(1 for x, y in zip(signature, other) if x == y) / self.num_perm
+                scored.append((estimate, name))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [name for _, name in scored]
+
+    def sync(self, folder, load_text, skip=lambda name: False):
+        """Bring the index in line with the files currently present in a folder."""
+        indexed = self.documents()
+        present = set()
+        for entry in os.scandir(folder):
+            if not entry.is_file() or skip(entry.name):
+                continue
+            present.add(entry.name)
+            mtime = entry.stat().st_mtime
+            if indexed.get(entry.name) != mtime:
+                try:
+                    self.add(entry.name, load_text(entry.path), mtime=mtime)
+                except Exception as e:
+                    print(f"Error indexing file {entry.path}: {e}")
+        for name in set(indexed) - present:
+            self.remove(name)
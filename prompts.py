@@ -0,0 +1,79 @@
+from chunking import PAGE_BREAK, estimate_tokens, iter_chunks
+
+TRUNCATION_NOTE = "\n\n[The rest of the input was cut to fit the prompt size limit.]"
+
+
+class PromptTemplate:
+    """A feature's fixed prompt prefix, rendered once and reused for every call.
+
+    ``render`` appends the input after the prefix, first fitting it into
+    whatever is left of the token budget once the prefix is accounted for.
+    """
+
+    def __init__(self, name, prefix, max_tokens):
+        self.name = name
+        self.prefix = prefix
+        self.max_tokens = max_tokens
+        self.prefix_tokens = estimate_tokens(prefix)
+        if self.input_tokens <= 0:
+            raise ValueError(
+                f"Prompt prefix for {name} ({self.prefix_tokens} tokens) "
+                f"does not fit the {max_tokens} token budget"
+            )
+
+    @property
+    def input_tokens(self):
+        """Token budget left for the input after the prefix."""
+        return self.max_tokens - self.prefix_tokens
+
+    def fit(self, text):
+        """Cut ``text`` on paragraph, sentence or word boundaries to fit the input budget."""
+        if estimate_tokens(text) <= self.input_tokens:
+            return text
+        room = self.input_tokens - estimate_tokens(TRUNCATION_NOTE)
+        head = next(iter_chunks(text.split(PAGE_BREAK), room), "") if room > 0 else ""
+        return head + TRUNCATION_NOTE
+
+    def render(self, text):
+        return self.prefix + self.fit(text)
+
+
+def few_shot_prefix(feature, spec):
+    instruction = spec.get("instruction")
+    examples = spec.get("examples")
+    if not isinstance(instruction, str) or not instruction.strip():
+        raise ValueError(f"Prompt for {feature} has no instruction")
+    if not examples:
+        raise ValueError(f"Prompt for {feature} has no examples")
+    for i, example in enumerate(examples, 1):
+        for field in ("input", "output"):
+            value = example.get(field)
+            if not isinstance(value, str) or not value.strip():
+                raise ValueError(f"Example {i} of the {feature} prompt has no {field}")
+
+    few_shot_context = "\n\n".join(
+        f"Example Input: {ex['input']}\nExample Output: {ex['output']}" for ex in examples
+    )
+    return f"{instruction}\n\nFew-shot Examples:\n{few_shot_context}\n\nNew Input:\n"
+
+
+def compile_prompts(few_shot_prompts, map_prompts, max_tokens):
+    """Validate and render the prompt prefixes of every feature.
+
+    Returns ``(templates, map_templates)``, each mapping feature names to a
+    PromptTemplate. Raises ValueError if a feature is missing its few-shot or
+    map prompt, a prompt is malformed, or a prefix leaves no room for input.
+    """
+    missing = set(few_shot_prompts) ^ set(map_prompts)
+    if missing:
+        raise ValueError(f"Features without both a few-shot and a map prompt: {', '.join(sorted(missing))}")
+    templates = {
+        feature: PromptTemplate(feature, few_shot_prefix(feature, spec), max_tokens)
+        for feature, spec in few_shot_prompts.items()
+    }
+    map_templates = {}
+    for feature, instruction in map_prompts.items():
+        if not isinstance(instruction, str) or not instruction.strip():
+            raise ValueError(f"Map prompt for {feature} is empty")
+        map_templates[feature] = PromptTemplate(f"{feature}:map", f"{instruction}\n\nSection:\n", max_tokens)
+    return templates, map_templates
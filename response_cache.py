@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_content(text):
+    return WHITESPACE_RE.sub(" ", text or "").strip()
+
+
+def make_cache_key(feature, instruction, examples, model_name, content, settings=None):
+    """Hash everything that influences a model response into a cache key.
+
+    The instruction and few-shot examples are part of the key, so editing a
+    feature's prompt automatically stops old responses from being served.
+    ``settings`` holds any other options that shape the prompt, such as
+    token budgets.
+    """
+    fields = [feature, instruction, examples, model_name, normalize_content(content)]
+    if settings:
+        fields.append(settings)
+    payload = json.dumps(
+        fields,
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Base class tracking hit/miss counters for the response cache backends."""
+
+    def __init__(self, max_entries=1024, ttl=24 * 60 * 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        value = self._get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self._set(key, value)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "backend": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "size": len(self),
+            }
+
+
+class MemoryResponseCache(ResponseCache):
+    name = "memory"
+
+    def __init__(self, max_entries=1024, ttl=24 * 60 * 60):
+        super().__init__(max_entries, ttl)
+        self._entries = OrderedDict()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteResponseCache(ResponseCache):
+    name = "sqlite"
+
+    def __init__(self, db_path, max_entries=10000, ttl=7 * 24 * 60 * 60):
+        super().__init__(max_entries, ttl)
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT, expires_at REAL, accessed_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+
+    def _connect(self):
+        return closing(sqlite3.connect(self.db_path, timeout=30, isolation_level=None))
+
+    def _get(self, key):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def _set(self, key, value):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl, now),
+            )
+            conn.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+def create_response_cache(backend, db_path=None, max_entries=1024, ttl=24 * 60 * 60):
+    if backend == "memory":
+        return MemoryResponseCache(max_entries=max_entries, ttl=ttl)
+    if backend == "sqlite":
+        return SQLiteResponseCache(db_path, max_entries=max_entries, ttl=ttl)
+    raise ValueError(f"Unknown response cache backend: {backend}")
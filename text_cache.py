@@ -0,0 +1,144 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+def file_sha256(file_path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TextCacheWriter:
+    """An entry being written page by page; it only becomes visible on ``commit``."""
+
+    def __init__(self, cache, key):
+        self.cache = cache
+        self.key = key
+        fd, self.tmp_path = tempfile.mkstemp(dir=cache.folder, suffix='.tmp')
+        self._file = os.fdopen(fd, 'w', encoding='utf-8', newline='')
+
+    def write(self, text):
+        self._file.write(text)
+
+    def commit(self):
+        self._file.close()
+        size = os.path.getsize(self.tmp_path)
+        if size > self.cache.max_bytes:
+            os.remove(self.tmp_path)
+            return
+        os.replace(self.tmp_path, self.cache._path(self.key))
+        self.cache._added(self.key, size)
+
+    def discard(self):
+        self._file.close()
+        try:
+            os.remove(self.tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+class TextCache:
+    """Content-addressed on-disk cache of extracted document text.
+
+    Entries are stored as ``<sha256>.txt`` files and evicted least recently
+    used first once the folder grows past ``max_bytes``. Recency survives
+    restarts through the entry files' mtimes.
+    """
+
+    def __init__(self, folder, max_bytes=256 * 1024 * 1024):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._total = 0
+        self._digests = {}
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(folder, exist_ok=True)
+        existing = []
+        for entry in os.scandir(folder):
+            if entry.is_file() and entry.name.endswith('.txt'):
+                stat = entry.stat()
+                existing.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(existing):
+            self._entries[key] = size
+            self._total += size
+
+    def _path(self, key):
+        return os.path.join(self.folder, f"{key}.txt")
+
+    def key_for(self, file_path):
+        """Return the SHA-256 of a file, re-hashing only when it has changed."""
+        stat = os.stat(file_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._digests.get(file_path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        digest = file_sha256(file_path)
+        self._digests[file_path] = (stamp, digest)
+        return digest
+
+    def contains(self, key):
+        """Return True if an entry is cached, without counting a hit or miss."""
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                text = f.read()
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            with self._lock:
+                self._total -= self._entries.pop(key, 0)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return text
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._total,
+            }
+
+    def writer(self, key):
+        """Start writing an entry in pieces, so the whole text never has to be held at once."""
+        return TextCacheWriter(self, key)
+
+    def put(self, key, text):
+        data = text.encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+        self._added(key, len(data))
+
+    def _added(self, key, size):
+        with self._lock:
+            self._total -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._total += size
+            while self._total > self.max_bytes and self._entries:
+                old_key, size = self._entries.popitem(last=False)
+                self._total -= size
+                try:
+                    os.remove(self._path(old_key))
+                except FileNotFoundError:
+                    pass